@@ -0,0 +1 @@
+"""Mesin perhitungan AKTA yang bisa dipakai tanpa antarmuka Streamlit."""
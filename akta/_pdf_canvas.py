@@ -0,0 +1,193 @@
+"""Renderer cepat laporan AKTA: menggambar langsung ke canvas ReportLab.
+
+Tata letak laporan AKTA hampir selalu sama; yang berubah hanya teks sel data
+(nama, tanggal, nominal). Renderer ini menjalankan platypus sekali per bentuk
+laporan (aturan, status SURPLUS/DEFISIT, bentuk proyeksi) dengan sel data
+diganti penanda (:class:`_Slot`), lalu menyimpan operator PDF setiap halaman
+beserta posisi setiap sel. Laporan berikutnya hanya menyalin operator itu dan
+menulis teks sel di koordinatnya, tanpa ``SimpleDocTemplate``, ``Table`` dan
+pemecahan baris ``Paragraph``.
+
+Bila teks sel tidak muat satu baris (mis. Nama yang sangat panjang) atau berisi
+markup, platypus akan mengubah tata letak, jadi laporan itu dirender lewat
+:func:`akta._pdf_render.generate_pdf`.
+
+Jangan diimpor langsung; pakai :func:`akta.pdf.generate_pdf_canvas`.
+"""
+from collections import namedtuple
+from datetime import datetime
+from io import BytesIO
+
+from reportlab.lib.colors import toColor
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.fonts import ps2tt, tt2ps
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable
+
+from akta import metrics
+from akta._pdf_render import PdfTemplate, generate_pdf as generate_pdf_platypus
+from akta._pdf_render import get_template, make_doc, report_status
+
+# Bentuk laporan berbeda yang disimpan tata letaknya (per proses)
+_LAYOUT_CACHE_SIZE = 64
+
+# Toleransi lebar teks terhadap lebar sel, dalam point
+_FIT_EPSILON = 1e-3
+
+# Karakter yang dibaca Paragraph sebagai markup
+_MARKUP = frozenset('<>&')
+
+_layouts = {}
+
+_Cell = namedtuple('_Cell', 'field draw x y room font size leading color')
+_Layout = namedtuple('_Layout', 'fonts pages')
+
+
+class _Slot(Flowable):
+    # Pengganti Paragraph satu baris: tingginya sama, posisinya dicatat saat digambar
+    def __init__(self, field, style, bold=False, color=None):
+        super().__init__()
+        self.field = field
+        self.style = style
+        family, _, italic = ps2tt(style.fontName)
+        self.font = tt2ps(family, bold, italic)
+        self.color = toColor(color) if color else style.textColor
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        return availWidth, self.style.leading
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        x = self._hAlignAdjust(x, _sW)
+        style = self.style
+        room = self.width - style.leftIndent - style.rightIndent
+        if style.alignment == TA_RIGHT:
+            draw, x = 'drawRightString', x + self.width - style.rightIndent
+        elif style.alignment == TA_CENTER:
+            draw, x = 'drawCentredString', x + style.leftIndent + room / 2
+        else:
+            draw, x = 'drawString', x + style.leftIndent
+        # Baris pertama Paragraph: baseline = puncak - fontSize
+        cell = _Cell(self.field, draw, x, y + style.leading - style.fontSize, room,
+                     self.font, style.fontSize, style.leading, self.color)
+        canvas.cells.append((len(canvas._code), cell))
+
+
+class _ProbeTemplate(PdfTemplate):
+    # Template yang sama, tetapi setiap sel data menjadi _Slot bernomor urut field
+    def __init__(self, template):
+        self.__dict__.update(template.__dict__)
+
+    def fields(self, *args, **kwargs):
+        return range(len(super().fields(*args, **kwargs)))
+
+    def cell(self, txt, style='normal', bold=False, color=None):
+        return _Slot(txt, self.styles[style], bold, color)
+
+
+class _RecordingCanvas(Canvas):
+    # Menyimpan operator setiap halaman dan posisi sel data di antaranya
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cells = []
+        self.pages = []
+
+    def showPage(self):
+        code, cells = self._code, self.cells
+        chunks = [code[start:end] for start, end in
+                  zip([0] + [i for i, _ in cells], [i for i, _ in cells] + [len(code)])]
+        self.pages.append((chunks, [cell for _, cell in cells]))
+        self.cells = []
+        super().showPage()
+
+
+def _build_layout(template, args, proyeksi):
+    probe = _ProbeTemplate(template)
+    doc = make_doc(BytesIO())
+    canvases = []
+
+    def canvasmaker(*a, **kw):
+        canvases.append(_RecordingCanvas(*a, **kw))
+        return canvases[-1]
+
+    doc.build(probe.build_story(*args, proyeksi), canvasmaker=canvasmaker)
+    canv = canvases[-1]
+    return _Layout(tuple(canv._doc.fontMapping), canv.pages)
+
+
+def _layout_key(template, allocations, proyeksi):
+    shape = None
+    if proyeksi is not None:
+        shape = (proyeksi.persentil, len(proyeksi.tahun), proyeksi.jalur)
+    return template, report_status(allocations), shape
+
+
+def _get_layout(template, args, proyeksi):
+    key = _layout_key(template, args[6], proyeksi)
+    layout = _layouts.get(key)
+    if layout is None:
+        with metrics.stage('pdf_layout'):
+            layout = _build_layout(template, args, proyeksi)
+        if len(_layouts) >= _LAYOUT_CACHE_SIZE:
+            _layouts.pop(next(iter(_layouts)), None)
+        _layouts[key] = layout
+    return layout
+
+
+def _fit(layout, values):
+    # Teks setiap sel seperti yang akan digambar Paragraph, atau None bila tata
+    # letaknya akan berubah (markup, lebih dari satu baris)
+    texts = list(values)
+    for _, cells in layout.pages:
+        for cell in cells:
+            text = values[cell.field]
+            if not _MARKUP.isdisjoint(text):
+                return None
+            text = ' '.join(text.split())
+            if stringWidth(text, cell.font, cell.size) > cell.room + _FIT_EPSILON:
+                return None
+            texts[cell.field] = text
+    return texts
+
+
+def _draw_cell(canv, cell, text):
+    canv.saveState()
+    canv.setFillColor(cell.color)
+    canv.setFont(cell.font, cell.size, cell.leading)
+    getattr(canv, cell.draw)(cell.x, cell.y, text)
+    canv.restoreState()
+
+
+def render(layout, texts, buffer):
+    """Tulis laporan dari ``layout`` dan teks sel ``texts`` ke ``buffer``."""
+    canv = make_doc(buffer)._makeCanvas(canvasmaker=Canvas)
+    for font in layout.fonts:  # nama font internal (F1, F2, ...) sama dengan saat direkam
+        canv._doc.getInternalFontName(font)
+    for chunks, cells in layout.pages:
+        for chunk, cell in zip(chunks, cells):
+            canv._code.extend(chunk)
+            _draw_cell(canv, cell, texts[cell.field])
+        canv._code.extend(chunks[-1])
+        canv.showPage()
+    canv.save()
+
+
+def generate_pdf(name, age, tetap, tidak_tetap, total_pemasukan, harga_emas, allocations,
+                 tanggal=None, template=None, rules=None, proyeksi=None):
+    if tanggal is None:
+        tanggal = datetime.now()
+    if template is None:
+        template = get_template(rules)
+    args = (name, age, tetap, tidak_tetap, total_pemasukan, harga_emas, allocations, tanggal)
+    layout = _get_layout(template, args, proyeksi)
+    with metrics.stage('pdf_fields'):
+        texts = _fit(layout, template.fields(*args, proyeksi))
+    if texts is None:
+        with metrics.stage('pdf_canvas_fallback'):
+            return generate_pdf_platypus(*args, template=template, proyeksi=proyeksi)
+    buffer = BytesIO()
+    with metrics.stage('pdf_canvas'):
+        render(layout, texts, buffer)
+    buffer.seek(0)
+    return buffer
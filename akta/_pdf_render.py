@@ -0,0 +1,420 @@
+"""Tata letak laporan PDF AKTA dengan ReportLab.
+
+Jangan diimpor langsung; pakai :mod:`akta.pdf`, yang memuat modul ini (dan
+ReportLab) hanya saat laporan pertama dirender.
+"""
+from copy import copy
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.platypus import (
+    SimpleDocTemplate, Table, TableStyle, Paragraph,
+    Spacer, HRFlowable, KeepTogether
+)
+
+from akta import metrics
+from akta.budget import format_idr_bulk
+from akta.money import MONTHLY_NOTE, monthly_amount
+from akta.rules import resolve_rules
+
+# Warna tema
+_C_GREEN_DARK  = colors.HexColor('#1B5E20')
+_C_GREEN_MED   = colors.HexColor('#2E7D32')
+_C_GREEN_LIGHT = colors.HexColor('#C8E6C9')
+_C_GREEN_PALE  = colors.HexColor('#E8F5E9')
+_C_STRIPE      = colors.HexColor('#F5F5F5')
+_C_RED_DARK    = colors.HexColor('#C62828')
+_C_RED_LIGHT   = colors.HexColor('#FFCDD2')
+_C_GRAY        = colors.HexColor('#757575')
+
+
+def _pdf_styles():
+    base = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle('title', parent=base['Normal'],
+            fontSize=18, fontName='Helvetica-Bold',
+            textColor=_C_GREEN_MED, alignment=TA_CENTER, spaceAfter=4),
+        'subtitle': ParagraphStyle('subtitle', parent=base['Normal'],
+            fontSize=10, textColor=_C_GRAY, alignment=TA_CENTER, spaceAfter=6),
+        'section': ParagraphStyle('section', parent=base['Normal'],
+            fontSize=12, fontName='Helvetica-Bold',
+            textColor=_C_GREEN_DARK, spaceBefore=10, spaceAfter=4),
+        'caption': ParagraphStyle('caption', parent=base['Normal'],
+            fontSize=8, fontName='Helvetica-Oblique',
+            textColor=_C_GRAY, spaceAfter=4),
+        'normal': ParagraphStyle('normal', parent=base['Normal'], fontSize=10),
+        'right': ParagraphStyle('right', parent=base['Normal'],
+            fontSize=10, alignment=TA_RIGHT),
+        'center': ParagraphStyle('center', parent=base['Normal'],
+            fontSize=9, alignment=TA_CENTER),
+        'footer': ParagraphStyle('footer', parent=base['Normal'],
+            fontSize=8, fontName='Helvetica-Oblique',
+            textColor=_C_GRAY, alignment=TA_CENTER),
+        'rec_surplus': ParagraphStyle('rec_surplus', parent=base['Normal'],
+            fontSize=9, textColor=_C_GREEN_DARK, leading=14,
+            leftIndent=6, rightIndent=6),
+        'rec_defisit': ParagraphStyle('rec_defisit', parent=base['Normal'],
+            fontSize=9, textColor=_C_RED_DARK, leading=14,
+            leftIndent=6, rightIndent=6),
+    }
+
+
+_PAGE_W = A4[0] - 3.6 * cm
+
+_CELL_PADDING = [
+    ('VALIGN',        (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING',   (0, 0), (-1, -1), 6),
+    ('RIGHTPADDING',  (0, 0), (-1, -1), 6),
+    ('TOPPADDING',    (0, 0), (-1, -1), 5),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+]
+
+_REC_TEXT = {
+    'DEFISIT': (
+        "<b>PERINGATAN:</b> Anggaran Anda mengalami <b>DEFISIT</b>. "
+        "Silakan tinjau kembali pos-pos pengeluaran yang mungkin melebihi persentase "
+        "yang disarankan. Pertimbangkan untuk mengurangi pos Belanja Sekarang atau "
+        "meningkatkan pemasukan."
+    ),
+    'SURPLUS': (
+        "<b>SELAMAT:</b> Anggaran Anda mengalami <b>SURPLUS</b>! "
+        "Disarankan untuk menambah alokasi pada Pos Dana Masa Depan dalam bentuk "
+        "investasi yang <b>AMAN dan MENGUNTUNGKAN</b>. Hindari hanya menabung; "
+        "gunakan instrumen investasi seperti reksa dana, obligasi, atau emas untuk "
+        "mengoptimalkan dana surplus Anda."
+    ),
+}
+
+
+def _highlight_commands(rows):
+    # Pos yang punya sub-pos (mis. Pos Utang) dan blok sub-posnya diberi latar
+    commands = []
+    for i, row in enumerate(rows, start=1):
+        if not row.bold:
+            continue
+        commands.append(('BACKGROUND', (0, i), (-1, i), _C_GREEN_PALE))
+        last = i
+        while last < len(rows) and rows[last].level:
+            last += 1
+        if last > i:
+            commands.append(('BACKGROUND', (0, i + 1), (-1, last), _C_GREEN_PALE))
+    return commands
+
+
+class PdfTemplate:
+    """Bagian laporan yang sama untuk semua orang, dibangun sekali.
+
+    Menyimpan gaya paragraf, ``TableStyle`` dan flowable statis (judul, label,
+    footer). Flowable disalin dangkal (``copy``) setiap kali dipakai karena
+    ReportLab menyimpan hasil ``wrap`` pada objeknya sendiri, sehingga satu
+    template aman dipakai bersamaan oleh beberapa thread. Baris tabel
+    pengeluaran diambil dari aturan alokasi (:mod:`akta.rules`).
+
+    Semua sel data dibuat lewat :meth:`cell` dari teks :meth:`fields`;
+    :mod:`akta._pdf_canvas` menggantinya untuk merekam posisi sel.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules = resolve_rules(rules)
+        with metrics.stage('pdf_styles'):
+            S = self.styles = _pdf_styles()
+        P = Paragraph
+
+        self.header = [
+            P("ANGGARAN KEUANGAN TAHUNAN (AKTA)", S['title']),
+            P("Laporan Perencanaan Keuangan Pribadi", S['subtitle']),
+            HRFlowable(width="100%", thickness=2, color=_C_GREEN_MED, spaceAfter=8),
+            P("DATA DIRI", S['section']),
+        ]
+        self.info_labels = [P("<b>Nama</b>", S['normal']),
+                            P("<b>Usia</b>", S['normal']),
+                            P("<b>Tanggal Dibuat</b>", S['normal'])]
+        self.info_style = TableStyle([
+            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [_C_STRIPE, colors.white]),
+            ('GRID',          (0, 0), (-1, -1), 0.4, colors.HexColor('#E0E0E0')),
+        ] + _CELL_PADDING)
+
+        self.masuk_head = [Spacer(1, 8), P("PEMASUKAN TAHUNAN", S['section'])]
+        self.masuk_labels = [
+            [P("<b>Keterangan</b>", S['normal']), P("<b>Jumlah</b>", S['normal'])],
+            P("Pemasukan Tetap", S['normal']),
+            P("Pemasukan Tidak Tetap", S['normal']),
+            P("<b>Total Pemasukan</b>", S['normal']),
+            P("Harga Per Gram Emas", S['normal']),
+        ]
+        self.masuk_style = TableStyle([
+            ('BACKGROUND',    (0, 0), (-1, 0), _C_GREEN_MED),
+            ('TEXTCOLOR',     (0, 0), (-1, 0), colors.white),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [_C_STRIPE, colors.white]),
+            ('BACKGROUND',    (0, 3), (-1, 3), _C_GREEN_LIGHT),
+            ('GRID',          (0, 0), (-1, -1), 0.4, colors.HexColor('#BDBDBD')),
+        ] + _CELL_PADDING)
+
+        self.keluar_head = [
+            Spacer(1, 10),
+            P("PENGELUARAN TAHUNAN", S['section']),
+            P("Pengeluaran tahunan ini merupakan pengeluaran yang dibagi pos sesuai "
+              "prioritas pengeluaran keuangan. " + MONTHLY_NOTE, S['caption']),
+        ]
+        self.keluar_header = [P("<b>Pos Pengeluaran</b>", S['normal']),
+                              P("<b>Persentase</b>", S['normal']),
+                              P("<b>Jumlah Tahunan</b>", S['normal']),
+                              P("<b>Jumlah Bulanan</b>", S['normal'])]
+        self.keluar_rows = [(P(row.pdf_label, S['normal']), P(row.pdf_pct, S['center']),
+                             row.key, row.bold)
+                            for row in rules.rows]
+        self.keluar_style = TableStyle([
+            ('BACKGROUND',    (0, 0), (-1, 0), _C_GREEN_MED),
+            ('TEXTCOLOR',     (0, 0), (-1, 0), colors.white),
+            ('LINEBELOW',     (0, 0), (-1, 0), 1.5, _C_GREEN_DARK),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [_C_STRIPE, colors.white]),
+        ] + _highlight_commands(rules.rows) + [
+            ('GRID',          (0, 0), (-1, -1), 0.4, colors.HexColor('#BDBDBD')),
+        ] + _CELL_PADDING)
+
+        self.total_label = P("<b>Total Anggaran</b>", S['normal'])
+        self.status_label = {
+            label: P(f"<font color='white'><b>Status: {label}</b></font>", S['normal'])
+            for label in ('SURPLUS', 'DEFISIT')
+        }
+        self.total_style = {
+            label: TableStyle([
+                ('BACKGROUND',    (0, 0), (-1, 0), _C_GREEN_LIGHT),
+                ('BACKGROUND',    (0, 1), (-1, 1), status_bg),
+                ('LINEABOVE',     (0, 0), (-1, 0), 1.5, _C_GREEN_DARK),
+                ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#BDBDBD')),
+                ('VALIGN',        (0, 0), (-1, -1), 'MIDDLE'),
+                ('LEFTPADDING',   (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING',  (0, 0), (-1, -1), 6),
+                ('TOPPADDING',    (0, 0), (-1, -1), 6),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ])
+            for label, status_bg in (('SURPLUS', _C_GREEN_MED), ('DEFISIT', _C_RED_DARK))
+        }
+
+        self.rec_para = {
+            'SURPLUS': P(_REC_TEXT['SURPLUS'], S['rec_surplus']),
+            'DEFISIT': P(_REC_TEXT['DEFISIT'], S['rec_defisit']),
+        }
+        self.rec_style = {
+            label: TableStyle([
+                ('BACKGROUND',    (0, 0), (-1, -1), rec_bg),
+                ('BOX',           (0, 0), (-1, -1), 1.2, rec_border),
+                ('LEFTPADDING',   (0, 0), (-1, -1), 10),
+                ('RIGHTPADDING',  (0, 0), (-1, -1), 10),
+                ('TOPPADDING',    (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ])
+            for label, rec_bg, rec_border in (('SURPLUS', _C_GREEN_LIGHT, _C_GREEN_MED),
+                                              ('DEFISIT', _C_RED_LIGHT, _C_RED_DARK))
+        }
+
+        self.proyeksi_head = [
+            Spacer(1, 10),
+            P("PROYEKSI DANA MASA DEPAN", S['section']),
+        ]
+        self.proyeksi_style = TableStyle([
+            ('BACKGROUND',    (0, 0), (-1, 0), _C_GREEN_MED),
+            ('TEXTCOLOR',     (0, 0), (-1, 0), colors.white),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [_C_STRIPE, colors.white]),
+            ('GRID',          (0, 0), (-1, -1), 0.4, colors.HexColor('#BDBDBD')),
+        ] + _CELL_PADDING)
+
+        self.footer = [
+            Spacer(1, 14),
+            HRFlowable(width="100%", thickness=1, color=_C_GREEN_MED, spaceAfter=4),
+            P("AKTA - Anggaran Keuangan Tahunan | "
+              "Membantu Anda merencanakan keuangan dengan lebih baik | HumanisGroup",
+              S['footer']),
+        ]
+
+    def cell(self, txt, style='normal', bold=False, color=None):
+        """Sel satu baris yang isinya bergantung pada data (nama, tanggal, nominal)."""
+        if bold:
+            txt = f"<b>{txt}</b>"
+        if color:
+            txt = f"<font color='{color}'>{txt}</font>"
+        return Paragraph(txt, self.styles[style])
+
+    def rp(self, txt, bold=False):
+        return self.cell(txt, 'right', bold)
+
+    def white_bold(self, t):
+        return self.cell(t, 'right', bold=True, color='white')
+
+    def fields(self, name, age, tetap, tidak_tetap, total_pemasukan, harga_emas,
+               allocations, tanggal, proyeksi=None):
+        """Teks semua sel data laporan, berurutan seperti dipakai :meth:`build_story`."""
+        # Semua nominal diformat dalam satu panggilan, urutannya sama dengan tabel
+        surplus_defisit = allocations['surplus_defisit']
+        amounts = [tetap, tidak_tetap, total_pemasukan, harga_emas]
+        for _, _, key, _ in self.keluar_rows:
+            amounts += [allocations[key], monthly_amount(allocations[key])]
+        amounts += [allocations['total_anggaran'], monthly_amount(allocations['total_anggaran']),
+                    abs(surplus_defisit), monthly_amount(abs(surplus_defisit))]
+        values = [name, f"{age} tahun", tanggal.strftime("%d %B %Y")]
+        values += format_idr_bulk(amounts)
+        if proyeksi is not None:
+            values += self.proyeksi_fields(proyeksi)
+        return values
+
+    def proyeksi_fields(self, proyeksi):
+        """Teks sel tabel proyeksi per baris: tahun, pemasukan median, lalu saldo per persentil."""
+        q = proyeksi.persentil
+        median = q.index(50) if 50 in q else len(q) // 2
+        pemasukan, saldo = proyeksi.get('pemasukan'), proyeksi.get('saldo_dana_masa_depan')
+        n = len(proyeksi.tahun)
+        amounts = list(pemasukan[median])
+        for row in saldo:
+            amounts += row
+        idr = format_idr_bulk(amounts)
+        values = []
+        for i, tahun in enumerate(proyeksi.tahun):
+            values.append(str(tahun))
+            values += [idr[i + k * n] for k in range(len(q) + 1)]
+        return values
+
+    def proyeksi_story(self, proyeksi, values=None):
+        """Tabel ringkasan :class:`~akta.projection.ProjectionSummary`.
+
+        ``values`` iterator teks sel (bawaan: :meth:`proyeksi_fields`).
+        """
+        S = self.styles
+        q = proyeksi.persentil
+        median = q.index(50) if 50 in q else len(q) // 2
+        if values is None:
+            values = iter(self.proyeksi_fields(proyeksi))
+
+        header = ["<b>Tahun ke-</b>", f"<b>Pemasukan (P{q[median]:g})</b>"]
+        header += [f"<b>Saldo P{p:g}</b>" for p in q]
+        data = [[Paragraph(t, S['normal']) for t in header]]
+        for _ in proyeksi.tahun:
+            data.append([self.cell(next(values), 'center')] +
+                        [self.rp(next(values), bold=k == median + 1)
+                         for k in range(len(q) + 1)])
+        label_w = _PAGE_W * 0.12
+        tbl = Table(data, colWidths=[label_w] + [(_PAGE_W - label_w) / (len(q) + 1)] * (len(q) + 1),
+                    repeatRows=1)
+        tbl.setStyle(self.proyeksi_style)
+        jalur = f"{proyeksi.jalur:,}".replace(",", ".")
+        caption = Paragraph(
+            f"Simulasi {jalur} skenario kenaikan pemasukan, harga emas, inflasi dan imbal "
+            "hasil investasi. Saldo adalah akumulasi Pos Dana Masa Depan (nominal) pada "
+            f"persentil {', '.join(f'P{p:g}' for p in q)}.", S['caption'])
+        # Judul tidak boleh tertinggal sendirian di bawah halaman
+        return [KeepTogether([copy(f) for f in self.proyeksi_head] + [caption, tbl])]
+
+    def build_story(self, name, age, tetap, tidak_tetap, total_pemasukan, harga_emas,
+                    allocations, tanggal, proyeksi=None):
+        """Susun story satu laporan; hanya sel yang bergantung pada data yang dibuat baru."""
+        cell, rp = self.cell, self.rp
+        story = [copy(f) for f in self.header]
+        values = iter(self.fields(name, age, tetap, tidak_tetap, total_pemasukan, harga_emas,
+                                  allocations, tanggal, proyeksi))
+
+        # ── DATA DIRI ──────────────────────────────────────────────────────
+        nama_lbl, usia_lbl, tgl_lbl = (copy(f) for f in self.info_labels)
+        info_tbl = Table([
+            [nama_lbl, cell(next(values))],
+            [usia_lbl, cell(next(values))],
+            [tgl_lbl,  cell(next(values))],
+        ], colWidths=[4 * cm, _PAGE_W - 4 * cm])
+        info_tbl.setStyle(self.info_style)
+        story.append(info_tbl)
+
+        # ── PEMASUKAN TAHUNAN ──────────────────────────────────────────────
+        story.extend(copy(f) for f in self.masuk_head)
+        header, tetap_lbl, tidak_lbl, total_lbl, emas_lbl = self.masuk_labels
+        masuk_tbl = Table([
+            [copy(f) for f in header],
+            [copy(tetap_lbl), rp(next(values))],
+            [copy(tidak_lbl), rp(next(values))],
+            [copy(total_lbl), rp(next(values), bold=True)],
+            [copy(emas_lbl),  rp(next(values))],
+        ], colWidths=[_PAGE_W * 0.55, _PAGE_W * 0.45])
+        masuk_tbl.setStyle(self.masuk_style)
+        story.append(masuk_tbl)
+
+        # ── PENGELUARAN TAHUNAN ────────────────────────────────────────────
+        story.extend(copy(f) for f in self.keluar_head)
+        keluar_data = [[copy(f) for f in self.keluar_header]]
+        for label, pct, _, bold in self.keluar_rows:
+            keluar_data.append([copy(label), copy(pct),
+                                rp(next(values), bold=bold), rp(next(values), bold=bold)])
+        cw = [_PAGE_W * 0.38, _PAGE_W * 0.14, _PAGE_W * 0.24, _PAGE_W * 0.24]
+        keluar_tbl = Table(keluar_data, colWidths=cw, repeatRows=1)
+        keluar_tbl.setStyle(self.keluar_style)
+        story.append(keluar_tbl)
+        story.append(Spacer(1, 6))
+
+        # ── TOTAL & STATUS ─────────────────────────────────────────────────
+        status = report_status(allocations)
+        total_tbl = Table([
+            [copy(self.total_label), rp(next(values), bold=True), rp(next(values), bold=True)],
+            [copy(self.status_label[status]),
+             self.white_bold(next(values)), self.white_bold(next(values))],
+        ], colWidths=[_PAGE_W * 0.52, _PAGE_W * 0.24, _PAGE_W * 0.24])
+        total_tbl.setStyle(self.total_style[status])
+        story.append(total_tbl)
+        story.append(Spacer(1, 10))
+
+        # ── REKOMENDASI ────────────────────────────────────────────────────
+        rec_tbl = Table([[copy(self.rec_para[status])]], colWidths=[_PAGE_W])
+        rec_tbl.setStyle(self.rec_style[status])
+        story.append(rec_tbl)
+
+        # ── PROYEKSI (opsional) ────────────────────────────────────────────
+        if proyeksi is not None:
+            story.extend(self.proyeksi_story(proyeksi, values))
+
+        # ── FOOTER ─────────────────────────────────────────────────────────
+        story.extend(copy(f) for f in self.footer)
+        return story
+
+
+def report_status(allocations):
+    """'SURPLUS' atau 'DEFISIT' menurut ``allocations['surplus_defisit']``."""
+    return "SURPLUS" if allocations['surplus_defisit'] >= 0 else "DEFISIT"
+
+
+@lru_cache(maxsize=None)
+def _template_for(rules):
+    return PdfTemplate(rules)
+
+
+def get_template(rules=None):
+    """Template laporan bersama per aturan alokasi (dibangun saat pertama dipakai)."""
+    return _template_for(resolve_rules(rules))
+
+
+def make_doc(buffer):
+    """``SimpleDocTemplate`` A4 dengan margin laporan AKTA yang menulis ke ``buffer``."""
+    return SimpleDocTemplate(
+        buffer, pagesize=A4,
+        leftMargin=1.8 * cm, rightMargin=1.8 * cm,
+        topMargin=1.5 * cm, bottomMargin=1.5 * cm,
+    )
+
+
+# Fungsi untuk generate PDF dengan ReportLab
+def generate_pdf(name, age, tetap, tidak_tetap, total_pemasukan, harga_emas, allocations,
+                 tanggal=None, template=None, rules=None, proyeksi=None):
+    if tanggal is None:
+        tanggal = datetime.now()
+    if template is None:
+        template = get_template(rules)
+    buffer = BytesIO()
+    doc = make_doc(buffer)
+    with metrics.stage('pdf_story'):
+        story = template.build_story(name, age, tetap, tidak_tetap, total_pemasukan,
+                                     harga_emas, allocations, tanggal, proyeksi)
+    with metrics.stage('pdf_build'):
+        doc.build(story)
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,386 @@
+"""Pembuatan laporan AKTA secara massal tanpa antarmuka Streamlit.
+
+Membaca CSV/JSONL berisi kolom ``nama, usia, tetap, tidak_tetap, harga_emas``
+(opsional ``periode``) baris demi baris, merender PDF di process pool, lalu menulis hasilnya ke
+direktori atau ke satu file ZIP. Jumlah pekerjaan yang sedang berjalan dibatasi
+sehingga memori tetap konstan berapa pun jumlah barisnya::
+
+    python -m akta.batch anggota.csv --out laporan/ --workers 8
+    python -m akta.batch anggota.jsonl --out laporan.zip
+    python -m akta.batch anggota.csv --out cabang.pdf     # satu PDF gabungan
+    python -m akta.batch anggota.csv --out anggaran.xlsx  # hanya angka (.csv/.json/.xlsx)
+    python -m akta.batch anggota.csv --out laporan/ --engine platypus
+
+Keluaran ``.csv``, ``.json`` atau ``.xlsx`` tidak merender PDF sama sekali:
+alokasi dihitung per blok secara vektor dan ditulis sebagai satu baris per
+rumah tangga (:mod:`akta.export`).
+
+PDF dirender dengan mesin ``canvas`` (:func:`akta.pdf.generate_pdf_canvas`),
+yang menggambar ulang tata letak yang sudah direkam; ``--engine platypus``
+menyusun tata letak setiap laporan seperti UI.
+
+Dengan ``--riwayat-emas harga_emas.csv`` kolom ``harga_emas`` boleh kosong;
+harganya diambil dari riwayat pada tanggal ``periode`` baris itu (bawaan:
+tanggal laporan) untuk cek nisab zakat.
+
+Baris yang isinya tidak valid (mis. usia bukan angka, ``tetap`` kosong,
+``periode`` bukan tanggal, atau tanggal sebelum riwayat harga emas) tidak
+menghentikan proses: baris itu dilaporkan ke stderr dan dihitung gagal, baris
+lainnya tetap ditulis.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime
+
+from akta.budget import calculate_budget_rupiah
+from akta.combined import PdfConcatWriter
+from akta.export import FORMATS as EXPORT_FORMATS, write_households
+from akta.gold import GoldPriceHistory
+from akta.pdf import ENGINES, safe_filename
+from akta.rules import RULE_SETS, get_rules
+
+FIELDS = ('nama', 'usia', 'tetap', 'tidak_tetap', 'harga_emas')
+# Kolom yang boleh tidak ada atau kosong
+OPTIONAL_FIELDS = ('harga_emas', 'periode')
+
+# Jumlah baris yang harga emasnya dicari sekaligus
+_LOOKUP_CHUNK = 4096
+
+
+def _parse_amount(value):
+    # Nominal harus terhingga, tidak negatif dan muat di int64 (lihat akta.money.to_rupiah)
+    if not isinstance(value, (int, float)):
+        value = str(value).strip()
+        try:
+            value = int(value)
+        except ValueError:
+            value = float(value)
+    if not math.isfinite(value) or not 0 <= value < 2 ** 63:
+        raise ValueError(value)
+    return value
+
+
+def _parse_date(value):
+    return datetime.strptime(str(value).strip(), '%Y-%m-%d').date()
+
+
+def _field(row, name, parse):
+    # Galat parsing menyebut kolom dan isinya, bukan pesan float()/int() bawaan
+    try:
+        return parse(row[name])
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} tidak valid: {row[name]!r}") from None
+
+
+def _empty(row, name):
+    return row.get(name) is None or str(row[name]).strip() == ''
+
+
+def _parse_household(row):
+    if not isinstance(row, dict):
+        raise ValueError(f"baris bukan objek JSON: {row!r}")
+    missing = [f for f in FIELDS if f not in row and f not in OPTIONAL_FIELDS]
+    if missing:
+        raise ValueError(f"kolom tidak ditemukan: {', '.join(missing)}")
+    return {
+        'nama': str(row['nama']).strip(),
+        'usia': _field(row, 'usia', lambda v: int(_parse_amount(v))),
+        'tetap': _field(row, 'tetap', _parse_amount),
+        'tidak_tetap': _field(row, 'tidak_tetap', _parse_amount),
+        'harga_emas': (None if _empty(row, 'harga_emas')
+                       else _field(row, 'harga_emas', _parse_amount)),
+        'periode': None if _empty(row, 'periode') else _field(row, 'periode', _parse_date),
+    }
+
+
+def _invalid_row(row, problem):
+    # Baris gagal tetap diteruskan (bukan dilewati) supaya nomor baris berikutnya benar
+    nama = row.get('nama') if isinstance(row, dict) else None
+    return {'nama': str(nama or '').strip(), 'galat': problem}
+
+
+def _json_rows(stream):
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield ValueError(f"JSON tidak valid: {exc}")
+
+
+def read_households(path):
+    """Baca rumah tangga dari CSV atau JSONL satu per satu (generator).
+
+    Baris yang tidak valid menghasilkan dict ``{'nama', 'galat'}`` di posisinya,
+    dengan ``galat`` pesan kesalahannya; :func:`run_batch` dan
+    :func:`akta.export.write_households` menghitungnya sebagai gagal. Kolom
+    wajib yang tidak ada di header CSV tetap menghentikan pembacaan.
+    """
+    if path == '-':
+        stream = sys.stdin
+        is_jsonl = False
+    else:
+        stream = open(path, newline='', encoding='utf-8')
+        is_jsonl = path.endswith(('.jsonl', '.ndjson'))
+    try:
+        if is_jsonl:
+            rows = _json_rows(stream)
+        else:
+            rows = csv.DictReader(stream)
+            header = rows.fieldnames or ()
+            missing = [f for f in FIELDS if f not in header and f not in OPTIONAL_FIELDS]
+            if missing:
+                raise ValueError(f"kolom tidak ditemukan: {', '.join(missing)}")
+        for row in rows:
+            if isinstance(row, Exception):  # baris JSONL yang tidak bisa di-parse
+                yield _invalid_row(None, str(row))
+                continue
+            try:
+                household = _parse_household(row)
+            except ValueError as exc:
+                household = _invalid_row(row, str(exc))
+            yield household
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def with_gold_prices(households, history, tanggal):
+    """Isi ``harga_emas`` yang kosong dari ``history`` per ``periode`` (atau ``tanggal``).
+
+    Baris diproses per blok sehingga pencarian harga tetap satu panggilan vektor
+    per blok, sementara input tetap dibaca sebagai aliran.
+    """
+    chunk = []
+    for row in households:
+        chunk.append(row)
+        if len(chunk) >= _LOOKUP_CHUNK:
+            yield from _fill_gold_prices(chunk, history, tanggal)
+            chunk = []
+    yield from _fill_gold_prices(chunk, history, tanggal)
+
+
+def _fill_gold_prices(rows, history, tanggal):
+    start = history.start
+    todo = []
+    for row in rows:
+        if 'galat' in row or row['harga_emas'] is not None:
+            continue
+        periode = row['periode'] or tanggal
+        if periode < start:
+            row['galat'] = (f"periode {periode.isoformat()} sebelum data harga emas pertama "
+                            f"({start.isoformat()})")
+        else:
+            todo.append(row)
+    if todo:
+        prices = history.prices_on([(row['periode'] or tanggal).isoformat() for row in todo])
+        for row, price in zip(todo, prices.tolist()):
+            row['harga_emas'] = price
+    return rows
+
+
+def report_filename(index, nama, tanggal):
+    return f"{index:06d}_{safe_filename(nama, tanggal)}"
+
+
+def render_household(index, row, tanggal, program='standar', engine='canvas'):
+    """Hitung anggaran satu rumah tangga dan kembalikan ``(index, nama file, bytes PDF)``."""
+    total_pemasukan = row['tetap'] + row['tidak_tetap']
+    if not row['nama']:
+        raise ValueError("nama kosong")
+    if total_pemasukan == 0:
+        raise ValueError("total pemasukan tidak boleh nol")
+    if row['harga_emas'] is None:
+        raise ValueError("harga_emas kosong (gunakan --riwayat-emas)")
+    rules = get_rules(program)
+    allocations = calculate_budget_rupiah(total_pemasukan, rules, row['harga_emas'])
+    buffer = ENGINES[engine](row['nama'], row['usia'], row['tetap'], row['tidak_tetap'],
+                             total_pemasukan, row['harga_emas'], allocations, tanggal,
+                             rules=rules)
+    return index, report_filename(index, row['nama'], tanggal), buffer.getvalue()
+
+
+class _DirectoryWriter:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, index, filename, data):
+        with open(os.path.join(self.path, filename), 'wb') as fh:
+            fh.write(data)
+
+    def skip(self, index):
+        pass
+
+    def close(self):
+        pass
+
+
+class _ZipWriter:
+    def __init__(self, path):
+        self.zf = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, index, filename, data):
+        self.zf.writestr(filename, data)
+
+    def skip(self, index):
+        pass
+
+    def close(self):
+        self.zf.close()
+
+
+class _CombinedWriter:
+    # Hasil pool datang tidak berurutan; tahan sebentar supaya urutan laporan di
+    # PDF gabungan sama dengan urutan input; yang ditahan hanya PDF di belakang
+    # pekerjaan yang belum selesai.
+    def __init__(self, path):
+        self.pdf = PdfConcatWriter(path)
+        self.next_index = 1
+        self.waiting = {}
+
+    def write(self, index, filename, data):
+        self.waiting[index] = data
+        self._flush()
+
+    def skip(self, index):
+        self.waiting[index] = None
+        self._flush()
+
+    def _flush(self):
+        while self.next_index in self.waiting:
+            data = self.waiting.pop(self.next_index)
+            if data is not None:
+                self.pdf.add(data)
+            self.next_index += 1
+
+    def close(self):
+        self.pdf.close()
+
+
+def _open_writer(out):
+    if out.lower().endswith('.zip'):
+        return _ZipWriter(out)
+    if out.lower().endswith('.pdf'):
+        return _CombinedWriter(out)
+    return _DirectoryWriter(out)
+
+
+def _progress(done, failed, started, stream):
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    stream.write(f"\r{done:,} laporan selesai, {failed:,} gagal ({rate:,.1f}/detik)")
+    stream.flush()
+
+
+def run_batch(households, out, workers=None, tanggal=None, max_pending=None,
+              progress=None, program='standar', engine='canvas'):
+    """Render semua rumah tangga ke ``out`` dan kembalikan ``(selesai, gagal)``.
+
+    Paling banyak ``max_pending`` pekerjaan (bawaan: 4 per worker) ditahan
+    sekaligus, sehingga iterator input dibaca sesuai kecepatan render.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    tanggal = tanggal or date.today()
+    get_rules(program)  # nama program salah gagal di sini, bukan di setiap baris
+    if engine not in ENGINES:
+        raise ValueError(f"mesin render {engine!r} tidak dikenal; pilih dari {sorted(ENGINES)}")
+    writer = _open_writer(out)
+    done = failed = 0
+    started = last_report = time.perf_counter()
+    pending = {}
+
+    def _fail(index, problem):
+        nonlocal failed
+        failed += 1
+        sys.stderr.write(f"\nbaris {index}: {problem}\n")
+        writer.skip(index)
+
+    def _collect(futures):
+        nonlocal done, last_report
+        for future in futures:
+            index = pending.pop(future)
+            try:
+                _, filename, data = future.result()
+            except Exception as exc:  # baris rusak tidak menghentikan seluruh proses
+                _fail(index, exc)
+                continue
+            writer.write(index, filename, data)
+            done += 1
+        now = time.perf_counter()
+        if progress is not None and (now - last_report >= 0.5 or not pending):
+            last_report = now
+            _progress(done, failed, started, progress)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for index, row in enumerate(households, start=1):
+                if 'galat' in row:  # sudah gagal saat dibaca, tidak perlu ke pool
+                    _fail(index, row['galat'])
+                    continue
+                pending[pool.submit(render_household, index, row, tanggal, program,
+                                     engine)] = index
+                if len(pending) >= max_pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(finished)
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(finished)
+    finally:
+        writer.close()
+        if progress is not None:
+            progress.write("\n")
+    return done, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m akta.batch',
+        description="Buat laporan PDF AKTA untuk banyak rumah tangga sekaligus.")
+    parser.add_argument('input', help="file CSV atau JSONL ('-' untuk CSV dari stdin)")
+    parser.add_argument('--out', required=True,
+                        help="direktori tujuan, path berakhiran .zip, .pdf untuk satu PDF gabungan, "
+                             "atau .csv/.json/.xlsx untuk angka saja tanpa PDF")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="jumlah proses (bawaan: jumlah core CPU)")
+    parser.add_argument('--tanggal', default=None,
+                        help="tanggal laporan YYYY-MM-DD (bawaan: hari ini)")
+    parser.add_argument('--program', default='standar', choices=sorted(RULE_SETS),
+                        help="aturan alokasi yang dipakai (bawaan: standar)")
+    parser.add_argument('--engine', default='canvas', choices=sorted(ENGINES),
+                        help="mesin render PDF (bawaan: canvas; platypus bila hasilnya diragukan)")
+    parser.add_argument('--riwayat-emas', default=None, metavar='FILE',
+                        help="riwayat harga emas (CSV tanggal,harga_emas atau .npy) untuk "
+                             "baris tanpa harga_emas")
+    parser.add_argument('--quiet', action='store_true', help="tanpa laporan progres")
+    args = parser.parse_args(argv)
+
+    tanggal = datetime.strptime(args.tanggal, '%Y-%m-%d').date() if args.tanggal else None
+    households = read_households(args.input)
+    if args.riwayat_emas:
+        households = with_gold_prices(households, GoldPriceHistory.load(args.riwayat_emas),
+                                      tanggal or date.today())
+    export_format = os.path.splitext(args.out)[1].lower().lstrip('.')
+    if export_format in EXPORT_FORMATS:
+        done, failed = write_households(households, args.out, export_format, args.program)
+        print(f"{done:,} rumah tangga ditulis ke {args.out}, {failed:,} gagal")
+        return 1 if failed else 0
+    done, failed = run_batch(
+        households, args.out,
+        workers=args.workers, tanggal=tanggal, program=args.program, engine=args.engine,
+        progress=None if args.quiet else sys.stderr,
+    )
+    print(f"{done:,} laporan ditulis ke {args.out}, {failed:,} gagal")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
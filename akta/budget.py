@@ -0,0 +1,182 @@
+"""Perhitungan alokasi Anggaran Keuangan Tahunan (AKTA).
+
+Tidak bergantung pada Streamlit maupun ReportLab; NumPy hanya diimpor oleh
+fungsi batch.
+"""
+import math
+from functools import lru_cache
+
+from akta.rules import NISAB_GRAM, get_rules, resolve_rules
+
+_STANDARD_RULES = get_rules()
+
+# Semua pos hasil calculate_budget untuk program standar
+POS_KEYS = _STANDARD_RULES.keys
+
+
+# Fungsi untuk format rupiah
+def format_idr(amount):
+    return f"Rp {amount:,.0f}".replace(",", ".")
+
+
+@lru_cache(maxsize=None)
+def _digit_tables():
+    import numpy as np
+
+    triplets = np.frombuffer(''.join(f"{i:03d}" for i in range(1000)).encode(),
+                             dtype=np.uint8).reshape(1000, 3)
+    pow10 = np.array([10 ** k for k in range(1, 19)], dtype=np.int64)
+    return triplets, pow10
+
+
+def _format_one(amount, prefix, thousands, decimal, decimals):
+    # Satu nilai dengan aturan yang sama seperti jalur vektor. ``amount`` dalam
+    # satuan terkecil (``10**-decimals`` rupiah) bila int, dalam rupiah bila float.
+    if isinstance(amount, float) and math.isfinite(amount):
+        scaled = amount * 10 ** decimals
+        negative = math.copysign(1.0, scaled) < 0  # -0,4 tetap "-0" seperti format_idr
+        amount = abs(round(scaled))
+    elif isinstance(amount, int):
+        negative = amount < 0
+        amount = abs(amount)
+    else:
+        text = f"{amount:,.{decimals}f}"  # NaN, inf, Decimal
+        return prefix + text.translate({ord(','): thousands, ord('.'): decimal})
+    whole, frac = divmod(amount, 10 ** decimals)
+    text = f"{'-' if negative else ''}{whole:,}".replace(',', thousands)
+    if decimals:
+        text += f"{decimal}{frac:0{decimals}d}"
+    return prefix + text
+
+
+# Di bawah jumlah ini overhead NumPy lebih mahal daripada format per nilai
+_BULK_MIN = 64
+
+
+def format_idr_bulk(amounts, prefix="Rp ", thousands=".", decimal=",", decimals=0):
+    """Format banyak nominal rupiah sekaligus; hasilnya list ``str``.
+
+    ``amounts`` sebaiknya bilangan bulat (rupiah, atau satuan ``10**-decimals``
+    rupiah bila ``decimals > 0``) dalam array NumPy, list, atau kolom tabel.
+    Bilangan bulat diformat tanpa konversi ke float. Nilai float dibulatkan
+    sekali ke satuan terkecil dengan aturan yang sama seperti :func:`format_idr`
+    (half-even, termasuk ``-0``), sehingga dengan argumen bawaan hasilnya
+    identik byte per byte dengan ``[format_idr(x) for x in amounts]``.
+
+    Semua angka dirakit sebagai satu buffer byte lalu dipecah sekali, tanpa
+    f-string dan ``replace`` per nilai. Bilangan bulat di atas 2**53 diformat
+    persis, sedangkan :func:`format_idr` melewatkannya lewat float.
+    """
+    import numpy as np
+
+    values = np.asarray(amounts)
+    if values.ndim != 1:
+        values = values.reshape(-1)
+    n = len(values)
+    if n < _BULK_MIN or values.dtype.kind not in 'fiub' or values.dtype == np.uint64:
+        # Sedikit nilai, atau int Python > int64 / Decimal / campuran objek
+        return [_format_one(x, prefix, thousands, decimal, decimals) for x in values.tolist()]
+
+    if values.dtype.kind == 'f':
+        scaled = values.astype(np.float64) * 10 ** decimals if decimals else values.astype(np.float64)
+        rounded = np.rint(scaled)
+        ok = np.isfinite(rounded) & (np.abs(rounded) < 2.0 ** 63)
+        negative = np.signbit(rounded)
+        units = np.where(ok, rounded, 0).astype(np.int64)
+    else:
+        units = values.astype(np.int64)
+        ok = units != np.iinfo(np.int64).min  # abs() tidak muat di int64
+        negative = units < 0
+        units = np.where(ok, units, 0)
+
+    triplets, pow10 = _digit_tables()
+    magnitude = np.abs(units)
+    if decimals:
+        magnitude, fraction = np.divmod(magnitude, 10 ** decimals)
+    ndigits = np.searchsorted(pow10, magnitude, side='right') + 1
+    groups = (int(ndigits.max()) + 2) // 3
+
+    pre = np.frombuffer(prefix.encode(), dtype=np.uint8)
+    sep = np.frombuffer(thousands.encode(), dtype=np.uint8)
+    dec = np.frombuffer(decimal.encode(), dtype=np.uint8)
+    ls, lp = len(sep), len(pre)
+
+    # Kelompok tiga digit dari kiri ke kanan, masing-masing diawali pemisah
+    triplet = np.empty((n, groups), dtype=np.intp)
+    rest = magnitude
+    for g in range(groups - 1, -1, -1):
+        rest, triplet[:, g] = np.divmod(rest, 1000)
+    block = np.empty((n, groups, ls + 3), dtype=np.uint8)
+    block[:, :, :ls] = sep
+    block[:, :, ls:] = triplets[triplet]
+    body = block.reshape(n, groups * (ls + 3))[:, ls:]
+
+    # Kolom dipakai bila jumlah digit di kanannya < ndigits
+    digit_rank = np.arange(3 * groups)[::-1].reshape(groups, 3)
+    rank = np.empty((groups, ls + 3), dtype=np.int64)
+    rank[:, :ls] = digit_rank[:, :1] + 1
+    rank[:, ls:] = digit_rank
+    rank = rank.reshape(-1)[ls:]
+
+    parts = [np.broadcast_to(pre, (n, lp)), np.full((n, 1), ord('-'), dtype=np.uint8), body]
+    if decimals:
+        digits = np.empty((n, decimals), dtype=np.uint8)
+        for j in range(decimals - 1, -1, -1):
+            fraction, digits[:, j] = np.divmod(fraction, 10)
+        parts += [np.broadcast_to(dec, (n, len(dec))), digits + ord('0')]
+    parts.append(np.full((n, 1), ord('\n'), dtype=np.uint8))
+    out = np.concatenate(parts, axis=1)
+
+    keep = np.ones(out.shape, dtype=bool)
+    keep[:, lp] = negative
+    keep[:, lp + 1:lp + 1 + body.shape[1]] = rank < ndigits[:, None]
+    result = out[keep].tobytes().decode('utf-8').split('\n')[:-1]
+
+    if not ok.all():
+        for i in np.flatnonzero(~ok).tolist():
+            result[i] = _format_one(values[i].item(), prefix, thousands, decimal, decimals)
+    return result
+
+
+# Fungsi untuk menghitung alokasi anggaran
+def nisab(harga_emas):
+    """Nisab zakat penghasilan per tahun untuk harga emas per gram ``harga_emas``."""
+    return harga_emas * NISAB_GRAM
+
+
+def calculate_budget(total_income, rules=None, harga_emas=None):
+    """Alokasi anggaran menurut aturan ``rules`` (bawaan: program standar).
+
+    Persentase tiap pos berasal dari :mod:`akta.rules`; ``rules`` boleh nama
+    program di ``RULE_SETS`` atau :class:`~akta.rules.RuleSet`. Bila
+    ``harga_emas`` diisi, Pos Zakat nol selama ``total_income`` di bawah
+    :func:`nisab` dan bagiannya masuk ke Pos Belanja Sekarang.
+    """
+    rules = _STANDARD_RULES if rules is None else resolve_rules(rules)
+    return rules.evaluate(total_income, harga_emas)
+
+
+def calculate_budget_batch(total_income, rules=None, harga_emas=None):
+    """Versi vektor dari :func:`calculate_budget` untuk banyak rumah tangga sekaligus.
+
+    ``total_income`` boleh berupa array NumPy, list, atau kolom tabel (mis.
+    ``pandas.Series``). Hasilnya dict berisi satu array ``float64`` per pos,
+    dengan urutan operasi yang sama persis dengan versi skalar sehingga setiap
+    elemen identik dengan ``calculate_budget(total_income[i])``. ``harga_emas``
+    boleh skalar atau array sepanjang ``total_income`` (mis. hasil
+    :meth:`akta.gold.GoldPriceHistory.prices_on`).
+    """
+    return resolve_rules(rules).evaluate_batch(total_income, harga_emas)
+
+
+def calculate_budget_rupiah(total_income, rules=None, harga_emas=None):
+    """Seperti :func:`calculate_budget`, tetapi setiap pos dalam rupiah bulat.
+
+    Pembagian memakai metode sisa terbesar (:mod:`akta.money`), sehingga
+    sub-pos tepat sama dengan Pos Utang, semua pos tepat sama dengan Total
+    Anggaran, dan :func:`akta.money.split_monthly` memecah tiap pos menjadi 12
+    nominal bulanan yang jumlahnya tepat. Skalar menghasilkan ``int``; array
+    (list, kolom tabel) menghasilkan satu array ``int64`` per pos.
+    """
+    rules = _STANDARD_RULES if rules is None else resolve_rules(rules)
+    return rules.evaluate_rupiah(total_income, harga_emas)
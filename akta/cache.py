@@ -0,0 +1,63 @@
+"""Cache hasil bersama per proses dengan batas ukuran dan umur (TTL).
+
+Seperti ``functools.lru_cache``, tetapi entri juga kedaluwarsa setelah ``ttl``
+detik dan aman dipakai dari banyak thread (satu thread skrip per sesi
+Streamlit). Nilai yang disimpan dibagikan apa adanya ke semua pemanggil, jadi
+hanya cache nilai yang tidak diubah (tuple, namedtuple, str)::
+
+    @ttl_cache(maxsize=4096, ttl=3600)
+    def tabel(total_pemasukan, program):
+        ...
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses maxsize currsize ttl')
+
+
+def ttl_cache(maxsize=1024, ttl=3600.0):
+    """Dekorator cache LRU berukuran ``maxsize`` dengan umur entri ``ttl`` detik.
+
+    Argumen fungsi harus hashable (hanya argumen posisi). Fungsi hasil punya
+    ``cache_info()`` dan ``cache_clear()`` seperti ``lru_cache``.
+    """
+    def decorator(fn):
+        lock = threading.Lock()
+        entries = OrderedDict()
+        stats = [0, 0]  # hits, misses
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(args)
+                if entry is not None and entry[0] > now:
+                    entries.move_to_end(args)
+                    stats[0] += 1
+                    return entry[1]
+                stats[1] += 1
+            # Dihitung di luar lock; dua sesi yang meleset bersamaan menghitung dua kali
+            value = fn(*args)
+            with lock:
+                entries[args] = (now + ttl, value)
+                entries.move_to_end(args)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return value
+
+        def cache_info():
+            with lock:
+                return CacheInfo(stats[0], stats[1], maxsize, len(entries), ttl)
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                stats[:] = [0, 0]
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
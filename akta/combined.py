@@ -0,0 +1,188 @@
+"""Satu PDF gabungan berisi laporan AKTA banyak rumah tangga, dengan memori konstan.
+
+ReportLab menyimpan semua halaman dokumen di memori sampai ``save``, jadi satu
+``doc.build`` untuk ribuan laporan tumbuh linear. Di sini setiap laporan tetap
+dirender sendiri (satu PDF kecil, halaman baru untuk setiap orang), lalu
+objek-objeknya dinomori ulang dan langsung ditulis ke file tujuan oleh
+:class:`PdfConcatWriter`. Tabel xref dan daftar halaman ditampung di file
+sementara, sehingga memori puncak sama untuk 100 maupun 100.000 laporan::
+
+    with open('cabang.pdf', 'wb') as fh:
+        write_combined_pdf(read_households('anggota.csv'), fh)
+"""
+import re
+import sys
+import tempfile
+from datetime import date
+
+from akta.budget import calculate_budget_rupiah
+
+_REF = re.compile(rb'(\d+) 0 R')
+_XREF_ENTRY = re.compile(rb'(\d{10}) \d{5} ([nf])')
+
+
+def _parse_pdf(data):
+    """Pecah PDF buatan ReportLab menjadi ``(objek, root, info)``.
+
+    ``objek`` memetakan nomor objek ke ``(kamus, sisa)``: ``kamus`` bagian
+    sebelum stream (berisi referensi yang perlu dinomori ulang), ``sisa`` data
+    stream apa adanya.
+    """
+    start = data.rindex(b'startxref')
+    xref_at = int(data[start + 9:].split()[0])
+    head, _, trailer = data[xref_at:start].partition(b'trailer')
+    offsets = [(int(off), n) for n, (off, kind) in enumerate(_XREF_ENTRY.findall(head))
+               if kind == b'n']
+    offsets.sort()
+    objects = {}
+    for i, (off, n) in enumerate(offsets):
+        end = offsets[i + 1][0] if i + 1 < len(offsets) else xref_at
+        body = data[off:end]
+        body = body[body.index(b'obj') + 3:body.rindex(b'endobj')].strip(b'\r\n')
+        split = body.find(b'>>\nstream')
+        if split < 0:
+            split = body.find(b'>>\r\nstream')
+        if split < 0:
+            objects[n] = (body, b'')
+        else:
+            objects[n] = (body[:split + 2], body[split + 2:])
+    root = int(re.search(rb'/Root (\d+) 0 R', trailer).group(1))
+    info = re.search(rb'/Info (\d+) 0 R', trailer)
+    return objects, root, int(info.group(1)) if info else None
+
+
+class PdfConcatWriter:
+    """Tulis banyak PDF ReportLab sebagai satu dokumen, objek demi objek.
+
+    ``out`` path atau stream biner yang bisa ditulis (tidak perlu ``seek``).
+    Objek 1 (Pages) dan 2 (Catalog) ditulis paling akhir; objek lain langsung
+    ditulis saat :meth:`add` dipanggil.
+    """
+
+    _PAGES, _CATALOG, _INFO = 1, 2, 3
+
+    def __init__(self, out, title="AKTA - Laporan Gabungan"):
+        self._own = isinstance(out, str)
+        self._out = open(out, 'wb') if self._own else out
+        self._pos = 0
+        self._next = 4
+        self.pages = 0
+        self.reports = 0
+        self.title = title
+        # Entri xref (20 byte per objek) dan referensi halaman ditampung di disk
+        self._xref = tempfile.TemporaryFile()
+        self._kids = tempfile.TemporaryFile()
+        self._write(b'%PDF-1.4\n%\x93\x8c\x8b\x9e AKTA\n')
+
+    def _write(self, data):
+        self._out.write(data)
+        self._pos += len(data)
+
+    def _write_object(self, number, body, rest=b''):
+        if number > self._INFO:
+            self._xref.write(b'%010d 00000 n \n' % self._pos)
+        offset = self._pos
+        self._write(b'%d 0 obj\n' % number + body + rest + b'\nendobj\n')
+        return offset
+
+    def add(self, data):
+        """Tambahkan satu PDF (bytes) sebagai halaman-halaman berikutnya."""
+        objects, root, info = _parse_pdf(data)
+        pages_obj = int(re.search(rb'/Pages (\d+) 0 R', objects[root][0]).group(1))
+        kids = [int(n) for n in _REF.findall(
+            re.search(rb'/Kids \[([^\]]*)\]', objects[pages_obj][0]).group(1))]
+        skip = {root, pages_obj, info}
+        mapping = {}
+        for n in sorted(objects):
+            if n not in skip:
+                mapping[n] = self._next
+                self._next += 1
+        mapping[pages_obj] = self._PAGES
+
+        def renumber(m):
+            return b'%d 0 R' % mapping[int(m.group(1))]
+
+        for n in sorted(mapping):
+            if n == pages_obj:
+                continue
+            body, rest = objects[n]
+            self._write_object(mapping[n], _REF.sub(renumber, body), rest)
+        for kid in kids:
+            self._kids.write(b'%d 0 R ' % mapping[kid])
+        self.pages += len(kids)
+        self.reports += 1
+
+    def close(self):
+        """Tulis Pages, Catalog, Info, tabel xref dan trailer."""
+        offsets = {}
+        offsets[self._INFO] = self._write_object(
+            self._INFO, b'<<\n/Producer (AKTA) /Title (%s)\n>>' % _pdf_string(self.title))
+        self._kids.seek(0)
+        offsets[self._PAGES] = self._pos
+        self._write(b'%d 0 obj\n<<\n/Count %d /Type /Pages /Kids [ '
+                    % (self._PAGES, self.pages))
+        self._copy(self._kids)
+        self._write(b']\n>>\nendobj\n')
+        offsets[self._CATALOG] = self._write_object(
+            self._CATALOG, b'<<\n/PageMode /UseNone /Pages %d 0 R /Type /Catalog\n>>' % self._PAGES)
+
+        xref_at = self._pos
+        self._write(b'xref\n0 %d\n0000000000 65535 f \n' % self._next)
+        for n in (self._PAGES, self._CATALOG, self._INFO):
+            self._write(b'%010d 00000 n \n' % offsets[n])
+        self._xref.seek(0)
+        self._copy(self._xref)
+        self._write(b'trailer\n<<\n/Info %d 0 R /Root %d 0 R /Size %d\n>>\nstartxref\n%d\n%%%%EOF\n'
+                    % (self._INFO, self._CATALOG, self._next, xref_at))
+        self._xref.close()
+        self._kids.close()
+        if self._own:
+            self._out.close()
+        else:
+            self._out.flush()
+
+    def _copy(self, src):
+        while True:
+            chunk = src.read(1 << 16)
+            if not chunk:
+                break
+            self._write(chunk)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _pdf_string(text):
+    escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return escaped.encode('latin-1', 'replace')
+
+
+def write_combined_pdf(households, out, tanggal=None, rules=None, engine='canvas', errors=None):
+    """Render setiap rumah tangga (dict seperti :func:`akta.batch.read_households`) ke satu PDF.
+
+    Laporan ditulis berurutan ke ``out`` (path atau stream biner) begitu
+    selesai dirender dengan mesin ``engine`` (:data:`akta.pdf.ENGINES`);
+    kembalikan ``(laporan, halaman)``. Baris yang gagal dibaca (ber-``galat``)
+    dilewati dan dilaporkan ke ``errors`` (bawaan: stderr).
+    """
+    from akta.pdf import ENGINES, get_template
+
+    generate_pdf = ENGINES[engine]
+    tanggal = tanggal or date.today()
+    template = get_template(rules)
+    errors = sys.stderr if errors is None else errors
+    with PdfConcatWriter(out) as writer:
+        for index, row in enumerate(households, start=1):
+            if 'galat' in row:
+                errors.write(f"baris {index}: {row['galat']}\n")
+                continue
+            total_pemasukan = row['tetap'] + row['tidak_tetap']
+            allocations = calculate_budget_rupiah(total_pemasukan, rules, row['harga_emas'])
+            buffer = generate_pdf(row['nama'], row['usia'], row['tetap'], row['tidak_tetap'],
+                                  total_pemasukan, row['harga_emas'], allocations, tanggal,
+                                  template=template)
+            writer.add(buffer.getvalue())
+    return writer.reports, writer.pages
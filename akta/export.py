@@ -0,0 +1,310 @@
+"""Ekspor angka tabel Pengeluaran Tahunan ke CSV, JSON dan XLSX tanpa ReportLab.
+
+Untuk pengguna yang hanya butuh angkanya, bukan laporan PDF. Semua nominal
+dalam rupiah bulat (:func:`akta.budget.calculate_budget_rupiah`); kolom
+bulanan adalah :func:`akta.money.monthly_amount`, sehingga jumlahnya bisa
+selisih beberapa rupiah dari bulanan Total Anggaran. XLSX tabel satu anggota
+mencantumkan :data:`akta.money.MONTHLY_NOTE` di bawah tabel; CSV dan JSON
+hanya berisi angka.
+
+- :func:`export_table`: satu anggota, satu baris per pos (untuk tombol unduh)
+- :func:`write_households`: banyak rumah tangga, satu baris per rumah tangga,
+  dihitung per blok secara vektor dan langsung ditulis ke file/stream, sehingga
+  memori tetap kecil berapa pun jumlah barisnya::
+
+    python -m akta.batch anggota.csv --out anggaran.xlsx
+
+XLSX ditulis langsung sebagai ZIP berisi XML SpreadsheetML minimal (satu
+sheet, string inline), tanpa dependensi tambahan.
+"""
+import csv
+import io
+import json
+import math
+import re
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+from akta.money import MONTHLY_NOTE, MONTHS, monthly_amount
+from akta.rules import resolve_rules
+
+FORMATS = {
+    'csv': 'text/csv',
+    'json': 'application/json',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+TABLE_COLUMNS = ('kode', 'pos', 'persen', 'batas', 'tahunan', 'bulanan')
+HOUSEHOLD_COLUMNS = ('nama', 'usia', 'tetap', 'tidak_tetap', 'harga_emas', 'total_pemasukan')
+
+# Jumlah rumah tangga yang dihitung dan ditulis sekaligus
+_CHUNK = 4096
+
+
+def _check_format(fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f"format ekspor {fmt!r} tidak dikenal; pilih dari {sorted(FORMATS)}")
+
+
+def table_rows(allocations, rules=None):
+    """Baris tabel Pengeluaran Tahunan ditambah Total Anggaran, urut seperti di UI."""
+    rules = resolve_rules(rules)
+    rows = [(r.key, r.label, r.persen, r.batas, allocations[r.key],
+             monthly_amount(allocations[r.key])) for r in rules.rows]
+    total = allocations['total_anggaran']
+    rows.append(('total_anggaran', 'Total Anggaran', 100, None, total, monthly_amount(total)))
+    return rows
+
+
+def export_table(allocations, rules=None, fmt='csv'):
+    """Tabel satu anggota sebagai bytes dalam format ``fmt`` ('csv', 'json', 'xlsx')."""
+    _check_format(fmt)
+    rows = table_rows(allocations, rules)
+    out = io.BytesIO()
+    writer = _WRITERS[fmt](out, TABLE_COLUMNS)
+    writer.write_rows(rows)
+    if fmt == 'xlsx':
+        writer.write_rows([(), (MONTHLY_NOTE,)])
+    writer.close()
+    return out.getvalue()
+
+
+def household_columns(rules=None):
+    """Kolom ekspor batch: data rumah tangga, lalu tahunan dan bulanan setiap pos."""
+    keys = [k for k in resolve_rules(rules).keys if k != 'surplus_defisit']
+    return HOUSEHOLD_COLUMNS + tuple(keys) + tuple(f"{k}_bulanan" for k in keys)
+
+
+def write_households(households, out, fmt='csv', rules=None, errors=None):
+    """Tulis alokasi setiap rumah tangga (dict :func:`akta.batch.read_households`) ke ``out``.
+
+    ``out`` path atau stream biner. Baris yang gagal dibaca (ber-``galat``), tanpa
+    nama, tanpa ``harga_emas``, dengan nominal negatif/tak hingga, dengan total
+    pemasukan nol, atau yang nominalnya terlalu besar untuk rupiah bulat dilewati
+    dan dilaporkan ke ``errors`` (bawaan: stderr), seperti
+    :func:`akta.batch.run_batch`. Kembalikan ``(ditulis, gagal)``.
+    """
+    _check_format(fmt)
+    rules = resolve_rules(rules)
+    errors = sys.stderr if errors is None else errors
+    keys = [k for k in rules.keys if k != 'surplus_defisit']
+    own = isinstance(out, str)
+    stream = open(out, 'wb') if own else out
+    done = failed = 0
+    try:
+        writer = _WRITERS[fmt](stream, household_columns(rules))
+        chunk = []
+
+        def flush():
+            nonlocal done, failed
+            for index, problem in _write_chunk(writer, chunk, rules, keys):
+                failed += 1
+                errors.write(f"baris {index}: {problem}\n")
+            done += len(chunk)
+            chunk.clear()
+
+        for index, row in enumerate(households, start=1):
+            problem = _invalid(row)
+            if problem:
+                failed += 1
+                errors.write(f"baris {index}: {problem}\n")
+                continue
+            chunk.append((index, row))
+            if len(chunk) >= _CHUNK:
+                flush()
+        flush()
+        writer.close()
+    finally:
+        if own:
+            stream.close()
+    return done, failed
+
+
+def _invalid(row):
+    if 'galat' in row:
+        return row['galat']
+    if not row['nama']:
+        return "nama kosong"
+    if row['harga_emas'] is None:
+        return "harga_emas kosong (gunakan --riwayat-emas)"
+    for field in ('tetap', 'tidak_tetap', 'harga_emas'):
+        value = row[field]
+        if not math.isfinite(value) or value < 0:
+            return f"{field} harus angka terhingga dan tidak negatif: {value!r}"
+    if row['tetap'] + row['tidak_tetap'] == 0:
+        return "total pemasukan tidak boleh nol"
+    return None
+
+
+def _evaluate(rules, chunk):
+    import numpy as np
+
+    total = np.array([row['tetap'] + row['tidak_tetap'] for _, row in chunk])
+    harga_emas = np.array([row['harga_emas'] for _, row in chunk], dtype=np.float64)
+    return rules.evaluate_rupiah(total, harga_emas)
+
+
+def _write_chunk(writer, chunk, rules, keys):
+    # Tulis baris ``(index, row)`` di ``chunk``; kembalikan ``(index, galat)`` yang gagal
+    if not chunk:
+        return []
+    try:
+        allocations = _evaluate(rules, chunk)
+    except (OverflowError, ValueError):
+        # Satu nominal di luar jangkauan int64 tidak boleh menggagalkan seluruh blok:
+        # cari baris penyebabnya satu per satu, lalu hitung ulang sisanya secara vektor
+        failed = []
+        for index, row in chunk:
+            try:
+                _evaluate(rules, [(index, row)])
+            except (OverflowError, ValueError) as exc:
+                failed.append((index, str(exc)))
+        if not failed:
+            raise
+        bad = {index for index, _ in failed}
+        chunk[:] = [item for item in chunk if item[0] not in bad]
+        return failed + _write_chunk(writer, chunk, rules, keys)
+    chunk = [row for _, row in chunk]
+    annual = [allocations[k] for k in keys]
+    columns = [[row['nama'] for row in chunk], [row['usia'] for row in chunk],
+               [row['tetap'] for row in chunk], [row['tidak_tetap'] for row in chunk],
+               [row['harga_emas'] for row in chunk], allocations['total_anggaran'].tolist()]
+    columns += [a.tolist() for a in annual]
+    columns += [(-(-a // MONTHS)).tolist() for a in annual]  # = monthly_amount per elemen
+    writer.write_rows(zip(*columns))
+    return []
+
+
+class _CsvWriter:
+    def __init__(self, out, columns):
+        self.out = out
+        self.buffer = io.StringIO()
+        self.csv = csv.writer(self.buffer, lineterminator='\r\n')
+        self.write_rows([columns])
+
+    def write_rows(self, rows):
+        self.csv.writerows(rows)
+        self.out.write(self.buffer.getvalue().encode('utf-8'))
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+    def close(self):
+        pass
+
+
+class _JsonWriter:
+    # Satu array JSON berisi objek per baris, ditulis bertahap
+    def __init__(self, out, columns):
+        self.out = out
+        self.columns = columns
+        self.first = True
+        out.write(b'[')
+
+    def write_rows(self, rows):
+        parts = []
+        for row in rows:
+            parts.append('\n' if self.first else ',\n')
+            parts.append(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False))
+            self.first = False
+        self.out.write(''.join(parts).encode('utf-8'))
+
+    def close(self):
+        self.out.write(b'\n]\n')
+
+
+_XLSX_STATIC = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="AKTA" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'),
+}
+
+
+def _column_letters(n):
+    letters = []
+    for i in range(n):
+        name = ''
+        i += 1
+        while i:
+            i, rem = divmod(i - 1, 26)
+            name = chr(65 + rem) + name
+        letters.append(name)
+    return letters
+
+
+def _zip_info(name):
+    # Tanggal tetap supaya isi yang sama selalu menghasilkan bytes yang sama
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+# Karakter kendali yang tidak sah di XML 1.0, bahkan bila di-escape
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class _XlsxWriter:
+    def __init__(self, out, columns):
+        self.zip = zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED)
+        for name, xml in _XLSX_STATIC.items():
+            self.zip.writestr(_zip_info(name), xml)
+        self.sheet = self.zip.open(_zip_info('xl/worksheets/sheet1.xml'), 'w', force_zip64=True)
+        self.sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                         b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                         b'<sheetData>')
+        self.letters = _column_letters(len(columns))
+        self.row = 0
+        self.write_rows([columns])
+
+    def write_rows(self, rows):
+        parts = []
+        for values in rows:
+            self.row += 1
+            n = self.row
+            parts.append(f'<row r="{n}">')
+            for letter, value in zip(self.letters, values):
+                if value is None:
+                    continue
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    # Excel tidak punya nilai NaN/tak hingga: biarkan selnya kosong
+                    if isinstance(value, float) and not math.isfinite(value):
+                        continue
+                    parts.append(f'<c r="{letter}{n}"><v>{value!r}</v></c>')
+                else:
+                    text = _XML_ILLEGAL.sub('', str(value))
+                    parts.append(f'<c r="{letter}{n}" t="inlineStr"><is><t xml:space="preserve">'
+                                 f'{escape(text)}</t></is></c>')
+            parts.append('</row>')
+        self.sheet.write(''.join(parts).encode('utf-8'))
+
+    def close(self):
+        self.sheet.write(b'</sheetData></worksheet>')
+        self.sheet.close()
+        self.zip.close()
+
+
+_WRITERS = {'csv': _CsvWriter, 'json': _JsonWriter, 'xlsx': _XlsxWriter}
@@ -0,0 +1,105 @@
+"""Riwayat harga emas per gram untuk cek nisab zakat pada periode lampau.
+
+Sumbernya file CSV lokal berkolom ``tanggal,harga_emas`` (YYYY-MM-DD, rupiah
+per gram), tidak harus terurut. File dibaca sekali, diurutkan per tanggal, lalu
+setiap pencarian memakai ``numpy.searchsorted`` sehingga jutaan pasangan
+(tanggal, pemasukan) cukup satu panggilan vektor, bukan pemindaian per baris.
+Harga untuk suatu tanggal adalah harga terakhir pada atau sebelum tanggal itu;
+bila ada tanggal ganda, baris terakhir di file yang dipakai.
+
+Untuk riwayat besar, simpan sekali ke ``.npy`` lalu buka dengan memory map::
+
+    GoldPriceHistory.from_csv('harga_emas.csv').save('harga_emas.npy')
+    history = GoldPriceHistory.load('harga_emas.npy')   # tanpa parsing ulang
+    harga = history.prices_on(df['periode'])
+"""
+import csv
+from datetime import date, timedelta
+
+
+class GoldPriceHistory:
+    """Harga emas per gram terurut menurut tanggal.
+
+    ``days`` adalah tanggal dalam hari sejak 1970-01-01 dan ``prices`` harganya,
+    keduanya array ``float64`` satu dimensi yang sudah terurut naik per tanggal.
+    """
+
+    def __init__(self, days, prices):
+        if len(days) != len(prices):
+            raise ValueError("jumlah tanggal dan harga emas harus sama")
+        if not len(days):
+            raise ValueError("riwayat harga emas kosong")
+        self.days = days
+        self.prices = prices
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Bangun riwayat dari pasangan ``(tanggal, harga)`` dalam urutan apa pun."""
+        import numpy as np
+
+        tanggal, harga = zip(*rows) if rows else ((), ())
+        days = np.asarray(tanggal, dtype='datetime64[D]').astype(np.int64)
+        order = np.argsort(days, kind='stable')
+        return cls(days[order].astype(np.float64),
+                   np.asarray(harga, dtype=np.float64)[order])
+
+    @classmethod
+    def from_csv(cls, path):
+        """Baca CSV berkolom ``tanggal`` dan ``harga_emas``."""
+        with open(path, newline='', encoding='utf-8') as fh:
+            reader = csv.DictReader(fh)
+            missing = [f for f in ('tanggal', 'harga_emas') if f not in (reader.fieldnames or ())]
+            if missing:
+                raise ValueError(f"kolom tidak ditemukan di {path}: {', '.join(missing)}")
+            rows = [(row['tanggal'].strip(), float(row['harga_emas']))
+                    for row in reader if row['tanggal'].strip()]
+        return cls.from_rows(rows)
+
+    @classmethod
+    def load(cls, path):
+        """Buka ``.npy`` hasil :meth:`save` (memory map) atau baca CSV."""
+        if not path.endswith('.npy'):
+            return cls.from_csv(path)
+        import numpy as np
+
+        table = np.load(path, mmap_mode='r')
+        if table.ndim != 2 or table.shape[0] != 2:
+            raise ValueError(f"{path} bukan riwayat harga emas AKTA")
+        # Baris 0 tanggal, baris 1 harga; keduanya tetap view kontigu dari file
+        return cls(table[0], table[1])
+
+    def save(self, path):
+        """Simpan sebagai ``.npy`` berbentuk (2, n) yang bisa di-memory map."""
+        import numpy as np
+
+        np.save(path, np.stack([self.days, self.prices]))
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def start(self):
+        """Tanggal data harga emas pertama; tanggal sebelumnya tidak punya harga."""
+        return date(1970, 1, 1) + timedelta(days=int(self.days[0]))
+
+    def prices_on(self, dates):
+        """Harga emas per gram untuk setiap tanggal di ``dates`` (array ``float64``).
+
+        ``dates`` boleh list ``date``/string YYYY-MM-DD, array ``datetime64``,
+        atau kolom tabel. Tanggal sebelum data pertama menghasilkan ValueError.
+        """
+        import numpy as np
+
+        days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64).astype(np.float64)
+        index = np.searchsorted(self.days, days, side='right') - 1
+        if index.size and index.min() < 0:
+            first = np.datetime64(int(self.days[0]), 'D')
+            raise ValueError(f"{int((index < 0).sum()):,} tanggal berada sebelum data harga "
+                             f"emas pertama ({first})")
+        return self.prices[index]
+
+    def price_on(self, tanggal):
+        """Harga emas per gram pada satu tanggal (``date`` atau string YYYY-MM-DD)."""
+        if isinstance(tanggal, date):
+            tanggal = tanggal.isoformat()
+        return float(self.prices_on([tanggal])[0])
@@ -0,0 +1,214 @@
+"""Instrumentasi opsional waktu dan alokasi memori per tahap AKTA.
+
+Dinyalakan lewat environment sebelum proses dimulai:
+
+- ``AKTA_METRICS=1``     waktu + alokasi (``tracemalloc``, menambah overhead)
+- ``AKTA_METRICS=time``  hanya waktu
+- ``AKTA_METRICS_PORT``  bila diisi, :func:`serve` membuka endpoint lokal
+  ``http://127.0.0.1:<port>/metrics`` (format teks ala Prometheus)
+
+Setiap tahap dicatat sebagai satu baris log JSON di logger ``akta.metrics``
+dan disimpan (maks. 1.024 sampel terakhir per tahap) untuk persentil agregat
+dan per sesi. Saat mati, :func:`stage` hanya mengembalikan context manager
+kosong yang sama, jadi biayanya satu panggilan fungsi::
+
+    with metrics.stage('calculate_budget'):
+        allocations = calculate_budget(total_pemasukan)
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, defaultdict, deque
+
+_MODE = os.environ.get('AKTA_METRICS', '').strip().lower()
+ENABLED = _MODE not in ('', '0', 'false', 'off')
+TRACE_MEMORY = ENABLED and _MODE != 'time'
+
+QUANTILES = (0.5, 0.9, 0.99)
+_SAMPLES = 1024
+_SESSION_SAMPLES = 256
+_MAX_SESSIONS = 256
+
+logger = logging.getLogger('akta.metrics')
+
+_session = contextvars.ContextVar('akta_metrics_session', default=None)
+_lock = threading.Lock()
+_aggregate = defaultdict(lambda: deque(maxlen=_SAMPLES))
+_sessions = OrderedDict()
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ('name', 'start', 'mem_start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if TRACE_MEMORY:
+            self.mem_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start
+        alloc = None
+        if TRACE_MEMORY:
+            # Puncak di atas memori awal tahap; tahap yang berjalan bersamaan di
+            # thread lain ikut terhitung, jadi anggap sebagai perkiraan
+            alloc = max(0, tracemalloc.get_traced_memory()[1] - self.mem_start)
+        record(self.name, wall, alloc)
+        return False
+
+
+def stage(name):
+    """Context manager yang mencatat waktu (dan alokasi) tahap ``name``."""
+    if not ENABLED:
+        return _NOOP
+    return _Stage(name)
+
+
+def set_session(session_id):
+    """Tandai tahap berikutnya di konteks ini sebagai milik sesi ``session_id``."""
+    if ENABLED:
+        _session.set(session_id)
+
+
+def record(name, wall, alloc=None):
+    """Simpan satu sampel; ``wall`` dalam detik, ``alloc`` dalam byte."""
+    session = _session.get()
+    sample = (wall, alloc)
+    with _lock:
+        _aggregate[name].append(sample)
+        if session is not None:
+            stages = _sessions.get(session)
+            if stages is None:
+                stages = _sessions[session] = defaultdict(lambda: deque(maxlen=_SESSION_SAMPLES))
+                while len(_sessions) > _MAX_SESSIONS:
+                    _sessions.popitem(last=False)
+            else:
+                _sessions.move_to_end(session)
+            stages[name].append(sample)
+    logger.info(json.dumps({'tahap': name, 'sesi': session, 'ms': round(wall * 1e3, 3),
+                            'alokasi_kib': None if alloc is None else round(alloc / 1024, 1)}))
+
+
+def _quantiles(values):
+    values = sorted(values)
+    return [values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES]
+
+
+def _stats(session=None):
+    with _lock:
+        source = _aggregate if session is None else _sessions.get(session, {})
+        snapshot = {name: list(samples) for name, samples in source.items()}
+    for name, samples in sorted(snapshot.items()):
+        allocs = [a for _, a in samples if a is not None]
+        yield (name, len(samples), _quantiles([w for w, _ in samples]),
+               _quantiles(allocs) if allocs else None)
+
+
+def summary(session=None):
+    """Persentil per tahap, agregat atau untuk satu sesi.
+
+    Hasilnya ``{tahap: {'count', 'ms': [p50, p90, p99], 'alokasi_kib': [...] | None}}``.
+    """
+    return {name: {'count': count,
+                   'ms': [round(w * 1e3, 3) for w in walls],
+                   'alokasi_kib': None if allocs is None else [round(a / 1024, 1) for a in allocs]}
+            for name, count, walls, allocs in _stats(session)}
+
+
+def render_text():
+    """Semua metrik (agregat, lalu per sesi) dalam format teks eksposisi Prometheus."""
+    with _lock:
+        sessions = list(_sessions)
+    seconds = ['# HELP akta_stage_seconds Waktu per tahap AKTA.',
+               '# TYPE akta_stage_seconds summary']
+    alloc = ['# HELP akta_stage_alloc_bytes Puncak alokasi per tahap AKTA (tracemalloc).',
+             '# TYPE akta_stage_alloc_bytes summary']
+    for session in [None] + sessions:
+        extra = '' if session is None else f',session="{session}"'
+        for name, count, walls, allocs in _stats(session):
+            labels = f'stage="{name}"{extra}'
+            for q, wall in zip(QUANTILES, walls):
+                seconds.append(f'akta_stage_seconds{{{labels},quantile="{q}"}} {wall:.6f}')
+            seconds.append(f'akta_stage_seconds_count{{{labels}}} {count}')
+            if allocs is not None:
+                for q, size in zip(QUANTILES, allocs):
+                    alloc.append(f'akta_stage_alloc_bytes{{{labels},quantile="{q}"}} {size}')
+                alloc.append(f'akta_stage_alloc_bytes_count{{{labels}}} {count}')
+    return '\n'.join(seconds + (alloc if len(alloc) > 2 else [])) + '\n'
+
+
+_server = None
+_serve_failed = False
+
+
+def serve(port=None, host='127.0.0.1'):
+    """Buka endpoint ``/metrics`` di thread latar belakang (sekali per proses).
+
+    Tidak melakukan apa pun bila instrumentasi mati atau port tidak diisi. Bila
+    port tidak bisa dipakai (mis. sudah dipakai proses lain), galatnya dicatat
+    sekali dan pemanggilan berikutnya langsung mengembalikan ``None``.
+    """
+    global _server, _serve_failed
+    port = port or int(os.environ.get('AKTA_METRICS_PORT', 0) or 0)
+    if not ENABLED or not port:
+        return None
+    with _lock:
+        if _server is not None or _serve_failed:
+            return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = render_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            _server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as exc:
+            _serve_failed = True
+            logger.warning("endpoint /metrics tidak dibuka di %s:%s: %s", host, port, exc)
+            return None
+        threading.Thread(target=_server.serve_forever, name='akta-metrics', daemon=True).start()
+        return _server
+
+
+if ENABLED:
+    if TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if not logger.handlers:
+        _handler = logging.StreamHandler()
+        _handler.setFormatter(logging.Formatter('%(asctime)s akta.metrics %(message)s'))
+        logger.addHandler(_handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
@@ -0,0 +1,127 @@
+"""Nominal rupiah sebagai bilangan bulat dengan pembagian yang selalu pas.
+
+Alokasi float (``total * 0.025``) lalu dibagi 12 dan dibulatkan saat
+ditampilkan membuat jumlah bulanan tidak sama dengan tahunan, dan sub-pos
+tidak selalu sama dengan pos induknya. Di sini setiap pembagian memakai metode
+sisa terbesar (*largest remainder*): tiap bagian mendapat hasil bagi bulat ke
+bawah, lalu kekurangannya dibagikan satu rupiah per bagian mulai dari sisa
+pecahan terbesar (seri: urutan bagian). Hasilnya deterministik dan jumlahnya
+selalu tepat sama dengan total::
+
+    >>> allocate(100, [1, 1, 1])
+    [34, 33, 33]
+    >>> sum(split_monthly(1_000_000_007))
+    1000000007
+
+Skalar memakai ``int`` Python; array memakai ``int64`` NumPy secara vektor.
+"""
+import math
+from fractions import Fraction
+
+MONTHS = 12
+
+# Catatan untuk setiap tabel yang menampilkan kolom :func:`monthly_amount`
+MONTHLY_NOTE = ("Nominal dalam rupiah bulat. Jumlah bulanan adalah bulan pertama; selisih "
+                "pembulatan jatuh di bulan-bulan awal sehingga 12 bulan tepat sama dengan "
+                "jumlah tahunan. Karena itu jumlah bulanan semua pos bisa selisih beberapa "
+                "rupiah dari Total Bulanan.")
+
+
+def _is_scalar(value):
+    return isinstance(value, (int, float)) or getattr(value, 'ndim', None) == 0
+
+
+def to_rupiah(amount):
+    """Bulatkan ke rupiah terdekat (half-even, seperti :func:`~akta.budget.format_idr`).
+
+    Skalar menjadi ``int``, array/list menjadi array ``int64``.
+    """
+    if _is_scalar(amount):
+        return round(amount) if isinstance(amount, float) else int(amount)
+    import numpy as np
+
+    values = np.asarray(amount)
+    if values.dtype.kind in 'iub':
+        return values.astype(np.int64)
+    values = np.rint(values.astype(np.float64))
+    if not np.isfinite(values).all() or np.abs(values).max(initial=0) >= 2.0 ** 63:
+        raise OverflowError("nominal di luar jangkauan int64")
+    return values.astype(np.int64)
+
+
+def integer_weights(fractions):
+    """Ubah persentase (mis. ``2.5``, ``35``) menjadi bobot bulat dengan skala yang sama.
+
+    Hasilnya ``(bobot, penyebut)`` dengan ``bobot[i] / penyebut == persen[i] / 100``.
+    """
+    exact = [Fraction(str(p)) if isinstance(p, float) else Fraction(p) for p in fractions]
+    scale = math.lcm(*(f.denominator for f in exact))
+    return [int(f * scale) for f in exact], 100 * scale
+
+
+def _allocate_one(total, weights, denom):
+    quotas, remainders = [], []
+    for w in weights:
+        q, r = divmod(total * w, denom)
+        quotas.append(q)
+        remainders.append(r)
+    short = total - sum(quotas)
+    if short:
+        for i in sorted(range(len(weights)), key=lambda i: -remainders[i])[:short]:
+            quotas[i] += 1
+    return quotas
+
+
+def allocate(total, weights):
+    """Bagi ``total`` rupiah sebanding ``weights`` (bilangan bulat) dengan metode sisa terbesar.
+
+    ``total`` skalar menghasilkan list ``int``; array sepanjang n menghasilkan
+    array ``int64`` (n, k). ``weights`` boleh (k,) atau (n, k) untuk bobot per
+    baris. Jumlah setiap baris hasil selalu sama dengan ``total``.
+    """
+    if _is_scalar(total) and (not hasattr(weights, 'ndim') or weights.ndim == 1):
+        weights = [int(w) for w in weights]
+        return _allocate_one(int(total), weights, sum(weights))
+    import numpy as np
+
+    total = np.asarray(total, dtype=np.int64).reshape(-1)
+    weights = np.asarray(weights, dtype=np.int64)
+    denom = weights.sum(axis=-1)
+    if len(total) and int(np.abs(total).max()) > np.iinfo(np.int64).max // max(int(denom.max()), 1):
+        raise OverflowError("total terlalu besar untuk dibagi dalam int64")
+    product = total[:, None] * weights
+    quotas, remainders = np.divmod(product, np.atleast_1d(denom)[..., None])
+    short = total - quotas.sum(axis=1)
+    # Peringkat sisa per baris, terbesar dulu; stable = seri menurut urutan bagian
+    order = np.argsort(-remainders, axis=1, kind='stable')
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.broadcast_to(np.arange(order.shape[1]), order.shape), axis=1)
+    quotas += rank < short[:, None]
+    return quotas
+
+
+def split_monthly(annual, months=MONTHS):
+    """Pecah nominal tahunan menjadi ``months`` nominal bulanan yang jumlahnya tepat.
+
+    Sisa pembagian jatuh ke bulan-bulan awal. Skalar menghasilkan list
+    ``int``; array sepanjang n menghasilkan array ``int64`` (n, months).
+    """
+    if _is_scalar(annual):
+        base, rest = divmod(int(annual), months)
+        return [base + (m < rest) for m in range(months)]
+    import numpy as np
+
+    base, rest = np.divmod(np.asarray(annual, dtype=np.int64).reshape(-1), months)
+    return base[:, None] + (np.arange(months) < rest[:, None])
+
+
+def monthly_amount(annual):
+    """Nominal per bulan untuk ditampilkan di tabel.
+
+    Untuk rupiah bulat: nominal bulan pertama :func:`split_monthly` (paling
+    besar), sehingga tabel konsisten dengan rincian 12 bulan. Nilai float
+    lama tetap dibagi 12.
+    """
+    if isinstance(annual, float):
+        return annual / MONTHS
+    return -(-int(annual) // MONTHS)
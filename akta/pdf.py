@@ -0,0 +1,93 @@
+"""Laporan PDF AKTA.
+
+Modul ini ringan: ReportLab (lewat :mod:`akta._pdf_render`) baru diimpor saat
+laporan pertama dibuat, sehingga UI, worker dan layanan lain yang hanya butuh
+perhitungan tidak ikut menanggung waktu impornya.
+
+Ada dua mesin dengan hasil yang sama: ``platypus`` (:func:`generate_pdf`,
+menyusun tata letak setiap laporan) dan ``canvas``
+(:func:`generate_pdf_canvas`, menggambar ulang tata letak yang sudah direkam;
+untuk batch).
+"""
+import importlib
+import re
+from functools import lru_cache
+
+from akta.rules import resolve_rules
+
+
+def _renderer(module='akta._pdf_render'):
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        if (exc.name or '').partition('.')[0] != 'reportlab':
+            raise
+        raise ImportError(
+            "Laporan PDF AKTA membutuhkan ReportLab: pip install reportlab"
+        ) from exc
+
+
+def __getattr__(name):
+    # PdfTemplate dan get_template tetap bisa diimpor dari akta.pdf
+    if name in ('PdfTemplate', 'get_template'):
+        return getattr(_renderer(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def safe_filename(nama, tanggal, ext='pdf'):
+    """Nama file laporan ASCII yang aman untuk sistem file dan header HTTP.
+
+    Selain huruf dan angka ASCII diganti ``_``, mis.
+    ``AKTA_Budi_Santoso_20260131.pdf``; nama tanpa huruf ASCII menjadi ``anggota``.
+    """
+    slug = re.sub(r'[^0-9A-Za-z]+', '_', nama).strip('_') or 'anggota'
+    return f"AKTA_{slug}_{tanggal.strftime('%Y%m%d')}.{ext}"
+
+
+def generate_pdf(name, age, tetap, tidak_tetap, total_pemasukan, harga_emas, allocations,
+                 tanggal=None, template=None, rules=None, proyeksi=None):
+    """Render laporan AKTA satu orang dan kembalikan ``BytesIO`` berisi PDF.
+
+    ``proyeksi`` (:class:`~akta.projection.ProjectionSummary`, opsional)
+    menambahkan tabel proyeksi dana masa depan.
+    """
+    return _renderer().generate_pdf(name, age, tetap, tidak_tetap, total_pemasukan,
+                                    harga_emas, allocations, tanggal, template, rules,
+                                    proyeksi)
+
+
+def generate_pdf_canvas(name, age, tetap, tidak_tetap, total_pemasukan, harga_emas,
+                        allocations, tanggal=None, template=None, rules=None, proyeksi=None):
+    """Seperti :func:`generate_pdf`, tetapi langsung ke canvas dari tata letak yang direkam.
+
+    Beberapa kali lebih cepat untuk banyak laporan. Laporan yang selnya tidak
+    muat satu baris (mis. Nama sangat panjang) tetap dirender lewat platypus.
+    """
+    return _renderer('akta._pdf_canvas').generate_pdf(
+        name, age, tetap, tidak_tetap, total_pemasukan, harga_emas, allocations, tanggal,
+        template, rules, proyeksi)
+
+
+# Nama mesin render -> fungsi, untuk opsi ``--engine``
+ENGINES = {'platypus': generate_pdf, 'canvas': generate_pdf_canvas}
+
+
+# Cache PDF per kombinasi input, supaya rerun dan download berulang tidak
+# menjalankan ulang doc.build
+_PDF_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=_PDF_CACHE_SIZE)
+def _cached_pdf_bytes(name, age, tetap, tidak_tetap, harga_emas, allocation_items, tanggal,
+                      rules, proyeksi):
+    buffer = generate_pdf(name, age, tetap, tidak_tetap, tetap + tidak_tetap, harga_emas,
+                          dict(allocation_items), tanggal, rules=rules, proyeksi=proyeksi)
+    return buffer.getvalue()
+
+
+def get_pdf_bytes(name, age, tetap, tidak_tetap, harga_emas, allocations, tanggal,
+                  rules=None, proyeksi=None):
+    """Render PDF AKTA (atau ambil dari cache) dan kembalikan isinya sebagai bytes."""
+    return _cached_pdf_bytes(name, age, tetap, tidak_tetap, harga_emas,
+                             tuple(sorted(allocations.items())), tanggal,
+                             resolve_rules(rules), proyeksi)
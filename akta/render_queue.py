@@ -0,0 +1,168 @@
+"""Antrean render PDF di latar belakang untuk sesi Streamlit (dan pemanggil lain).
+
+``doc.build`` ReportLab tidak lagi berjalan di thread skrip sesi: pekerjaan
+dikirim ke satu pool thread bersama berukuran tetap, dan sesi cukup memeriksa
+``Future`` hasilnya. Pekerjaan identik yang sedang berjalan digabung (satu
+render untuk banyak sesi), hasil yang sudah jadi disimpan di cache LRU, dan
+jumlah pekerjaan yang menunggu dibatasi supaya satu lonjakan tidak menghabiskan
+CPU seluruh aplikasi. Render yang gagal juga diingat, sehingga pemanggil
+berikutnya langsung mendapat galatnya alih-alih merender ulang: galat dari data
+(``ValueError``, ``LayoutError`` ReportLab) selama masih di cache, galat lain
+(mis. ``MemoryError``, ``OSError`` font) hanya ``_FAILURE_TTL`` detik supaya
+render bisa dicoba lagi.
+
+Cache hasil antrean ini satu-satunya cache PDF di jalur ini: pekerjaan
+memanggil :func:`akta.pdf.generate_pdf` langsung, bukan ``get_pdf_bytes``.
+:meth:`RenderQueue.lookup` memeriksa pekerjaan yang sudah ada tanpa memulai
+render baru, untuk UI yang hanya merender saat pengguna memintanya.
+
+Thread, bukan proses: Streamlit menjalankan skrip sebagai ``__main__``, sehingga
+worker ``spawn`` akan mengeksekusi ulang AKTA.py. Batas jumlah worker menjaga
+render tidak merebut GIL dari sesi lain. Ukuran diatur lewat environment:
+
+- ``AKTA_PDF_WORKERS``: render bersamaan (bawaan: 2)
+- ``AKTA_PDF_QUEUE``: pekerjaan berjalan + menunggu (bawaan: 4 per worker)
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from reportlab.platypus.doctemplate import LayoutError
+
+from akta.pdf import generate_pdf
+from akta.rules import resolve_rules
+
+_CACHE_SIZE = 128
+
+# Galat yang pasti berulang untuk argumen yang sama
+_DETERMINISTIC_ERRORS = (ValueError, LayoutError)
+
+# Detik galat lain diingat sebelum render boleh dicoba lagi
+_FAILURE_TTL = 30.0
+
+
+class RenderQueueFull(RuntimeError):
+    """Terlalu banyak PDF yang sedang dirender atau menunggu; coba lagi nanti."""
+
+
+def _render(name, age, tetap, tidak_tetap, harga_emas, allocation_items, tanggal, rules,
+            proyeksi):
+    return generate_pdf(name, age, tetap, tidak_tetap, tetap + tidak_tetap, harga_emas,
+                        dict(allocation_items), tanggal, rules=rules,
+                        proyeksi=proyeksi).getvalue()
+
+
+def _settled(result=None, exception=None):
+    future = Future()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+    return future
+
+
+class RenderQueue:
+    """Pool render PDF bersama dengan de-duplikasi, cache hasil dan galat, dan batas antrean."""
+
+    def __init__(self, workers=None, max_pending=None, cache_size=_CACHE_SIZE):
+        self.workers = workers or 2
+        self.max_pending = max_pending or self.workers * 4
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._done = OrderedDict()
+        self._failed = OrderedDict()
+        self._pool = None
+
+    @staticmethod
+    def key(name, age, tetap, tidak_tetap, harga_emas, allocations, tanggal,
+            rules=None, proyeksi=None):
+        """Kunci pekerjaan untuk argumen :meth:`submit` (hashable)."""
+        return (name, age, tetap, tidak_tetap, harga_emas, tuple(sorted(allocations.items())),
+                tanggal, resolve_rules(rules), proyeksi)
+
+    def lookup(self, key):
+        """``Future`` pekerjaan ``key`` yang selesai, gagal atau sedang berjalan; ``None`` bila belum ada."""
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key):
+        if key in self._done:
+            self._done.move_to_end(key)
+            return _settled(self._done[key])
+        if key in self._failed:
+            exception, expires = self._failed[key]
+            if expires is None or time.monotonic() < expires:
+                return _settled(exception=exception)
+            del self._failed[key]
+        return self._pending.get(key)
+
+    def submit(self, name, age, tetap, tidak_tetap, harga_emas, allocations, tanggal,
+               rules=None, proyeksi=None):
+        """Kembalikan ``Future`` berisi bytes PDF; pekerjaan identik berbagi satu Future.
+
+        Render yang pernah gagal tidak diulang (galat selain ``ValueError`` dan
+        ``LayoutError`` hanya selama ``_FAILURE_TTL`` detik): Future-nya langsung
+        berisi galat yang sama. Melempar :class:`RenderQueueFull` bila antrean
+        sudah penuh.
+        """
+        key = self.key(name, age, tetap, tidak_tetap, harga_emas, allocations, tanggal,
+                       rules, proyeksi)
+        with self._lock:
+            future = self._lookup(key)
+            if future is not None:
+                return future
+            if len(self._pending) >= self.max_pending:
+                raise RenderQueueFull(f"{len(self._pending)} PDF sedang dalam antrean")
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix='akta-pdf')
+            # Salin konteks supaya metrik render tercatat untuk sesi pengirim
+            future = self._pool.submit(contextvars.copy_context().run, _render, *key)
+            self._pending[key] = future
+        future.add_done_callback(lambda f: self._finish(key, f))
+        return future
+
+    def _finish(self, key, future):
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.cancelled():
+                return
+            exception = future.exception()
+            if exception is None:
+                cache, value = self._done, future.result()
+            elif isinstance(exception, _DETERMINISTIC_ERRORS):
+                cache, value = self._failed, (exception, None)
+            else:
+                cache, value = self._failed, (exception, time.monotonic() + _FAILURE_TTL)
+            cache[key] = value
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_render_queue():
+    """Antrean bersama per proses, dibuat saat pertama dipakai."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            workers = int(os.environ.get('AKTA_PDF_WORKERS', 0)) or None
+            max_pending = int(os.environ.get('AKTA_PDF_QUEUE', 0)) or None
+            _queue = RenderQueue(workers, max_pending)
+        return _queue
@@ -0,0 +1,281 @@
+"""Aturan alokasi AKTA sebagai data, dikompilasi sekali menjadi evaluator.
+
+Satu aturan (program anggota) berisi daftar pos dengan persentase dari total
+pemasukan, sifat batasnya, sub-pos opsional, dan satu pos sisa::
+
+    {
+        'nama': 'Standar',
+        'pos': [
+            {'key': 'zakat', 'label': 'Pos Zakat', 'persen': 2.5, 'batas': 'tetap'},
+            {'key': 'utang_total', 'label': 'Pos Utang', 'persen': 35, 'batas': 'maks',
+             'sub': [{'key': 'utang_produktif', 'label': 'a. Utang Produktif',
+                      'persen': 20, 'batas': 'maks'}, ...]},
+            ...
+        ],
+        'sisa': {'key': 'belanja_sekarang', 'label': 'Pos Belanja Sekarang'},
+    }
+
+``batas`` ('tetap', 'maks', 'min') menentukan teks persentase di tabel UI dan
+PDF; nilai alokasinya sendiri selalu persentase tersebut. Pos dengan
+``'nisab': True`` (zakat) hanya diisi bila total pemasukan mencapai nisab,
+yaitu harga emas per gram x :data:`NISAB_GRAM`; di bawah nisab pos itu nol dan
+bagiannya masuk ke pos sisa. :func:`compile_rules`
+menghasilkan kode Python untuk aturan itu (seperti ``namedtuple``), sehingga
+evaluasinya sama cepat dengan fungsi yang ditulis tangan dan bekerja untuk
+skalar maupun array NumPy.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+BATAS = ('tetap', 'maks', 'min')
+NISAB_GRAM = 85  # nisab zakat penghasilan setara 85 gram emas per tahun
+_RESERVED_KEYS = ('total_anggaran', 'surplus_defisit')
+
+STANDARD_RULES = {
+    'nama': 'Standar',
+    'pos': [
+        {'key': 'zakat', 'label': 'Pos Zakat', 'persen': 2.5, 'batas': 'tetap', 'nisab': True},
+        {'key': 'iswaf', 'label': 'Pos ISWAF', 'persen': 7.5, 'batas': 'maks'},
+        {'key': 'utang_total', 'label': 'Pos Utang', 'persen': 35, 'batas': 'maks', 'sub': [
+            {'key': 'utang_produktif', 'label': 'a. Utang Produktif', 'persen': 20, 'batas': 'maks'},
+            {'key': 'utang_konsumtif', 'label': 'b. Utang Konsumtif', 'persen': 15, 'batas': 'maks'},
+        ]},
+        {'key': 'kontribusi_asuransi', 'label': 'Pos Kontribusi Asuransi Syariah',
+         'persen': 10, 'batas': 'min'},
+        {'key': 'dana_masa_depan', 'label': 'Pos Dana Masa Depan', 'persen': 10, 'batas': 'min'},
+    ],
+    'sisa': {'key': 'belanja_sekarang', 'label': 'Pos Belanja Sekarang'},
+}
+
+# Program yang bisa dipilih; tambahkan aturan lain di sini dengan kunci unik
+RULE_SETS = {
+    'standar': STANDARD_RULES,
+}
+
+# Satu baris tabel pengeluaran. level 0 = pos, 1 = sub-pos; persen None dan batas
+# 'sisa' untuk pos sisa; nisab True untuk pos yang hanya diisi di atas nisab.
+Row = namedtuple('Row', 'key level label ui_label ui_pct pdf_label pdf_pct bold persen batas '
+                        'nisab')
+
+
+def _pct_text(persen, decimal):
+    text = f"{persen:g}"
+    return text.replace('.', decimal)
+
+
+def _row(pos, level, has_sub):
+    batas, persen, label = pos.get('batas'), pos.get('persen'), pos['label']
+    if persen is None:  # pos sisa
+        ui_pct, pdf_pct = "", "Sisa"
+    else:
+        ui, pdf = _pct_text(persen, '.'), _pct_text(persen, ',')
+        if batas == 'min':
+            ui_pct, pdf_pct = f"min ({ui}%)", f"Min {pdf}%"
+        elif batas == 'maks':
+            ui_pct = f"Max ({ui}%)" if level else f"(Max {ui}% dari Total Pemasukan)"
+            pdf_pct = f"Maks {pdf}%"
+        else:
+            ui_pct, pdf_pct = f"({ui}% dari Total Pemasukan)", f"{pdf}%"
+    if level:
+        ui_label, pdf_label = f"  └─ {label}", f"   └─ {label}"
+    else:
+        ui_label = label
+        pdf_label = f"<b>{label}</b>" if has_sub else label
+    return Row(pos['key'], level, label, ui_label, ui_pct, pdf_label, pdf_pct, has_sub, persen,
+               'sisa' if persen is None else batas or 'tetap', bool(pos.get('nisab')))
+
+
+def _validate(spec):
+    seen = set()
+
+    def check(pos):
+        if not pos['key'].isidentifier() or pos['key'] in _RESERVED_KEYS:
+            raise ValueError(f"key pos {pos['key']!r} tidak valid")
+        if pos['key'] in seen:
+            raise ValueError(f"pos {pos['key']!r} didefinisikan lebih dari sekali")
+        seen.add(pos['key'])
+        if pos.get('batas', 'tetap') not in BATAS:
+            raise ValueError(f"batas pos {pos['key']!r} harus salah satu dari {BATAS}")
+        if not 0 <= pos['persen'] <= 100:
+            raise ValueError(f"persen pos {pos['key']!r} harus di antara 0 dan 100")
+
+    for pos in spec['pos']:
+        check(pos)
+        subs = pos.get('sub', ())
+        for sub in subs:
+            check(sub)
+            if sub.get('nisab'):
+                raise ValueError(f"nisab hanya berlaku untuk pos utama, bukan sub-pos {sub['key']!r}")
+        if subs and pos.get('nisab'):
+            raise ValueError(f"pos {pos['key']!r} yang memakai nisab tidak boleh punya sub-pos")
+        if subs and sum(s['persen'] for s in subs) > pos['persen']:
+            raise ValueError(f"jumlah persen sub-pos {pos['key']!r} melebihi pos induknya")
+    if not spec['sisa']['key'].isidentifier() or spec['sisa']['key'] in _RESERVED_KEYS:
+        raise ValueError(f"key pos sisa {spec['sisa']['key']!r} tidak valid")
+    if spec['sisa']['key'] in seen:
+        raise ValueError("pos sisa tidak boleh sama dengan pos lain")
+    if sum(p['persen'] for p in spec['pos']) > 100:
+        raise ValueError("jumlah persen semua pos melebihi 100%")
+
+
+def _generate_source(spec):
+    # Urutan operasi float sama dengan calculate_budget versi awal. Syarat nisab
+    # dikalikan sebagai bool (1/0), jadi bekerja untuk skalar maupun array.
+    lines = ["def evaluate(total_income, harga_emas=None):", "    allocations = {}"]
+    if any(pos.get('nisab') for pos in spec['pos']):
+        lines += ["    if harga_emas is not None:",
+                  f"        wajib_zakat = total_income >= harga_emas * {NISAB_GRAM!r}"]
+    for pos in spec['pos']:
+        key, factor = pos['key'], pos['persen'] / 100
+        subs = pos.get('sub', ())
+        if subs:
+            lines.append(f"    pos_{key} = total_income * {factor!r}")
+            for sub in subs:
+                lines.append(f"    allocations[{sub['key']!r}] = "
+                             f"pos_{key} * {sub['persen'] / pos['persen']!r}")
+            lines.append(f"    allocations[{key!r}] = pos_{key}")
+        else:
+            lines.append(f"    allocations[{key!r}] = total_income * {factor!r}")
+        if pos.get('nisab'):
+            lines += ["    if harga_emas is not None:",
+                      f"        allocations[{key!r}] = allocations[{key!r}] * wajib_zakat"]
+    terms = " + ".join(f"allocations[{pos['key']!r}]" for pos in spec['pos']) or "0"
+    sisa = spec['sisa']['key']
+    lines += [
+        f"    total_tetap = ({terms})",
+        f"    allocations[{sisa!r}] = total_income - total_tetap",
+        f"    allocations['total_anggaran'] = total_tetap + allocations[{sisa!r}]",
+        "    allocations['surplus_defisit'] = total_income - allocations['total_anggaran']",
+        "    return allocations",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _rupiah_plan(spec):
+    # Bobot bulat pos utama (terakhir: pos sisa) dan sub-pos (terakhir: bagian
+    # induk yang tidak dibagi ke sub-pos, dibuang) dengan satu skala bersama
+    from akta.money import integer_weights
+
+    persen = [pos['persen'] for pos in spec['pos']]
+    persen += [sub['persen'] for pos in spec['pos'] for sub in pos.get('sub', ())]
+    weights, denom = integer_weights(persen)
+    weights = iter(weights)
+    top = [next(weights) for _ in spec['pos']]
+    subs = {}
+    for i, pos in enumerate(spec['pos']):
+        if pos.get('sub'):
+            sub_weights = [next(weights) for _ in pos['sub']]
+            subs[i] = ([sub['key'] for sub in pos['sub']],
+                       sub_weights + [top[i] - sum(sub_weights)])
+    nisab_at = next((i for i, pos in enumerate(spec['pos']) if pos.get('nisab')), None)
+    keys = [pos['key'] for pos in spec['pos']] + [spec['sisa']['key']]
+    return keys, top + [denom - sum(top)], nisab_at, subs
+
+
+class RuleSet:
+    """Aturan alokasi yang sudah dikompilasi.
+
+    ``evaluate(total_income, harga_emas=None)`` menerima skalar maupun array
+    NumPy, ``evaluate_batch`` menerima apa pun yang bisa diubah ke array (list,
+    kolom tabel), dan ``evaluate_rupiah`` menghasilkan rupiah bulat yang jumlahnya
+    pas. Tanpa ``harga_emas`` pos nisab selalu diisi. ``rows`` adalah baris
+    tabel pengeluaran untuk UI dan PDF, ``keys`` semua pos hasil evaluasi.
+    """
+
+    def __init__(self, name, spec):
+        _validate(spec)
+        self.name = name
+        self.title = spec.get('nama', name)
+        self.source = _generate_source(spec)
+        namespace = {}
+        exec(compile(self.source, f"<aturan {name}>", 'exec'), namespace)
+        self.evaluate = namespace['evaluate']
+
+        rows = []
+        for pos in spec['pos']:
+            subs = pos.get('sub', ())
+            rows.append(_row(pos, 0, bool(subs)))
+            rows.extend(_row(sub, 1, False) for sub in subs)
+        rows.append(_row(spec['sisa'], 0, False))
+        self.rows = tuple(rows)
+        self.keys = tuple(self.evaluate(0))
+        self._plan = _rupiah_plan(spec)
+
+    def evaluate_batch(self, total_income, harga_emas=None):
+        import numpy as np
+
+        if harga_emas is not None:
+            harga_emas = np.asarray(harga_emas, dtype=np.float64)
+        return self.evaluate(np.asarray(total_income, dtype=np.float64), harga_emas)
+
+    def evaluate_rupiah(self, total_income, harga_emas=None):
+        """Alokasi dalam rupiah bulat dengan pembagian sisa terbesar (:mod:`akta.money`).
+
+        ``total_income`` dibulatkan ke rupiah. Semua pos utama ditambah pos sisa
+        tepat sama dengan ``total_anggaran`` (= total pemasukan), dan sub-pos
+        tepat sama dengan pos induknya bila persentasenya habis terbagi. Skalar
+        menghasilkan ``int``, array menghasilkan array ``int64``.
+        """
+        from akta.money import allocate, to_rupiah
+
+        income = to_rupiah(total_income)
+        scalar = isinstance(income, int)
+        keys, weights, nisab_at, subs = self._plan
+        if harga_emas is not None and nisab_at is not None:
+            # Di bawah nisab bobot pos zakat pindah ke pos sisa (bobot terakhir)
+            if scalar:
+                if not income >= harga_emas * NISAB_GRAM:
+                    weights = list(weights)
+                    weights[-1] += weights[nisab_at]
+                    weights[nisab_at] = 0
+            else:
+                import numpy as np
+
+                bebas = ~(income >= np.asarray(harga_emas, dtype=np.float64) * NISAB_GRAM)
+                weights = np.tile(np.asarray(weights, dtype=np.int64), (len(income), 1))
+                weights[bebas, -1] += weights[bebas, nisab_at]
+                weights[bebas, nisab_at] = 0
+        parts = allocate(income, weights)
+        if not scalar:
+            parts = list(parts.T)
+
+        allocations = {}
+        for i, key in enumerate(keys):
+            if i in subs:
+                sub_keys, sub_weights = subs[i]
+                sub_parts = allocate(parts[i], sub_weights)
+                if not scalar:
+                    sub_parts = list(sub_parts.T)
+                for sub_key, value in zip(sub_keys, sub_parts):
+                    allocations[sub_key] = value
+            allocations[key] = parts[i]
+        allocations['total_anggaran'] = income
+        allocations['surplus_defisit'] = income - income
+        return allocations
+
+    def __repr__(self):
+        return f"<RuleSet {self.name!r}>"
+
+
+def compile_rules(spec, name=None):
+    """Kompilasi satu aturan (dict) menjadi :class:`RuleSet`."""
+    return RuleSet(name or spec.get('nama', 'kustom'), spec)
+
+
+@lru_cache(maxsize=None)
+def get_rules(name='standar'):
+    """RuleSet terdaftar di ``RULE_SETS``, dikompilasi sekali per proses."""
+    try:
+        spec = RULE_SETS[name]
+    except KeyError:
+        raise ValueError(f"program {name!r} tidak dikenal; pilih dari {sorted(RULE_SETS)}") from None
+    return RuleSet(name, spec)
+
+
+def resolve_rules(rules=None):
+    """Terima ``None`` (standar), nama program, atau :class:`RuleSet`."""
+    if rules is None:
+        return get_rules()
+    if isinstance(rules, RuleSet):
+        return rules
+    return get_rules(rules)
@@ -0,0 +1,342 @@
+"""Layanan HTTP asyncio untuk perhitungan anggaran dan laporan PDF AKTA.
+
+Hanya memakai pustaka standar, supaya portal anggota, integrasi payroll dan
+sistem lain bisa memanggil AKTA tanpa halaman Streamlit::
+
+    python -m akta.server --port 8080 --workers 4
+
+Endpoint (body JSON, respons JSON kecuali PDF):
+
+- ``POST /anggaran``        ``{"tetap", "tidak_tetap", "harga_emas"?, "program"?, "bulat"?}``
+- ``POST /anggaran/batch``  ``{"pemasukan": [...], "harga_emas"?: angka | [...], "program"?, "bulat"?}``
+- ``POST /pdf``             ``{"nama", "usia", "tetap", "tidak_tetap", "harga_emas", "tanggal"?, "program"?}``
+- ``GET  /health``
+- ``GET  /metrics``          waktu per tahap (teks Prometheus; aktif bila ``AKTA_METRICS`` diisi)
+
+Dengan ``"bulat": true`` alokasi dikembalikan sebagai rupiah bulat yang
+jumlahnya pas (lihat :func:`akta.budget.calculate_budget_rupiah`).
+
+Render ReportLab berjalan di process pool berukuran tetap sehingga event loop
+tidak pernah terblokir. Jumlah permintaan yang diproses bersamaan dan jumlah
+PDF yang menunggu di pool dibatasi; di atas batas itu layanan langsung
+menjawab ``503`` dengan ``Retry-After`` (backpressure) alih-alih menumpuk antrean.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from urllib.parse import quote
+
+from akta import metrics
+from akta.budget import calculate_budget, calculate_budget_rupiah
+from akta.pdf import safe_filename
+from akta.rules import resolve_rules
+
+MAX_BODY = 8 * 1024 * 1024
+MAX_BATCH = 100_000
+_MAX_HEADERS = 100
+
+_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+def _number(payload, key, default=None):
+    value = payload.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise HttpError(400, f"{key!r} harus berupa angka")
+    return value
+
+
+def _rules(payload):
+    try:
+        return resolve_rules(payload.get('program'))
+    except ValueError as exc:
+        raise HttpError(400, str(exc)) from None
+
+
+def _render_pdf(name, age, tetap, tidak_tetap, harga_emas, tanggal, program):
+    # Dijalankan di process pool; impor di sini supaya proses utama tetap ringan
+    from akta.pdf import get_pdf_bytes
+
+    allocations = calculate_budget_rupiah(tetap + tidak_tetap, program, harga_emas)
+    return get_pdf_bytes(name, age, tetap, tidak_tetap, harga_emas, allocations, tanggal,
+                         program)
+
+
+class AktaServer:
+    """Server HTTP/1.1 (keep-alive) dengan batas konkurensi dan process pool PDF.
+
+    ``max_concurrency`` membatasi permintaan yang sedang diproses, ``max_pending_pdf``
+    (bawaan: 4 per worker) membatasi PDF yang sedang dirender atau menunggu pool.
+    """
+
+    def __init__(self, workers=None, max_concurrency=256, max_pending_pdf=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency
+        self.max_pending_pdf = max_pending_pdf or self.workers * 4
+        self.active = 0
+        self.pending_pdf = 0
+        self.pool = None
+        self.routes = {
+            ('POST', '/anggaran'): self.handle_budget,
+            ('POST', '/anggaran/batch'): self.handle_batch,
+            ('POST', '/pdf'): self.handle_pdf,
+            ('GET', '/health'): self.handle_health,
+            ('GET', '/metrics'): self.handle_metrics,
+        }
+
+    # ── Endpoint ───────────────────────────────────────────────────────────
+
+    async def handle_budget(self, payload):
+        tetap, tidak_tetap = _number(payload, 'tetap'), _number(payload, 'tidak_tetap', 0)
+        harga_emas = payload.get('harga_emas')
+        if harga_emas is not None:
+            harga_emas = _number(payload, 'harga_emas')
+        rules = _rules(payload)
+        calculate = calculate_budget_rupiah if payload.get('bulat') else calculate_budget
+        with metrics.stage('calculate_budget'):
+            allocations = calculate(tetap + tidak_tetap, rules, harga_emas)
+        return _json_response({'total_pemasukan': tetap + tidak_tetap, 'alokasi': allocations})
+
+    async def handle_batch(self, payload):
+        pemasukan = payload.get('pemasukan')
+        if not isinstance(pemasukan, list):
+            raise HttpError(400, "'pemasukan' harus berupa list angka")
+        if len(pemasukan) > MAX_BATCH:
+            raise HttpError(413, f"paling banyak {MAX_BATCH:,} pemasukan per permintaan")
+        harga_emas = payload.get('harga_emas')
+        if isinstance(harga_emas, list) and len(harga_emas) != len(pemasukan):
+            raise HttpError(400, "panjang 'harga_emas' harus sama dengan 'pemasukan'")
+        rules = _rules(payload)
+        calculate = rules.evaluate_rupiah if payload.get('bulat') else rules.evaluate_batch
+
+        def compute():
+            try:
+                result = calculate(pemasukan, harga_emas)
+            except (TypeError, ValueError):
+                raise HttpError(400, "'pemasukan' dan 'harga_emas' harus berupa angka") from None
+            except OverflowError:
+                raise HttpError(400, "nominal terlalu besar untuk rupiah bulat") from None
+            return _json_response({'alokasi': {k: v.tolist() for k, v in result.items()}})
+
+        # NumPy dan json.dumps untuk batch besar dijalankan di thread, bukan di event loop
+        return await asyncio.to_thread(compute)
+
+    async def handle_pdf(self, payload):
+        name = str(payload.get('nama') or '').strip()
+        if not name:
+            raise HttpError(400, "'nama' wajib diisi")
+        age = _number(payload, 'usia')
+        tetap, tidak_tetap = _number(payload, 'tetap'), _number(payload, 'tidak_tetap', 0)
+        harga_emas = _number(payload, 'harga_emas')
+        if tetap + tidak_tetap == 0:
+            raise HttpError(400, "total pemasukan tidak boleh nol")
+        try:
+            tanggal = (datetime.strptime(payload['tanggal'], '%Y-%m-%d').date()
+                       if payload.get('tanggal') else date.today())
+        except (TypeError, ValueError):
+            raise HttpError(400, "'tanggal' harus berformat YYYY-MM-DD") from None
+        program = _rules(payload).name
+
+        if self.pending_pdf >= self.max_pending_pdf:
+            raise HttpError(503, "antrean render PDF penuh, coba lagi", (('Retry-After', '1'),))
+        self.pending_pdf += 1
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(
+                self.pool, _render_pdf, name, int(age), tetap, tidak_tetap, harga_emas,
+                tanggal, program)
+        finally:
+            self.pending_pdf -= 1
+        return 200, data, (('Content-Type', 'application/pdf'),
+                           ('Content-Disposition', content_disposition(name, tanggal)))
+
+    async def handle_health(self, payload):
+        return _json_response({'status': 'ok', 'aktif': self.active,
+                               'pdf_menunggu': self.pending_pdf})
+
+    async def handle_metrics(self, payload):
+        if not metrics.ENABLED:
+            raise HttpError(404, "metrik tidak aktif; jalankan dengan AKTA_METRICS=1")
+        return 200, metrics.render_text().encode(), (
+            ('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'),)
+
+    # ── HTTP ───────────────────────────────────────────────────────────────
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                status, data, extra = await self.dispatch(method, path, body)
+                try:
+                    response = _encode_response(status, data, extra, keep_alive)
+                except ValueError as exc:  # header tidak bisa dikirim (mis. bukan latin-1)
+                    response = _encode_response(*_error_response(
+                        HttpError(500, f"header respons tidak valid: {exc}")), keep_alive)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as exc:  # request rusak: jawab lalu tutup koneksi
+            writer.write(_encode_response(*_error_response(exc), keep_alive=False))
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        handler = self.routes.get((method, path.split('?', 1)[0]))
+        try:
+            if handler is None:
+                if any(p == path.split('?', 1)[0] for _, p in self.routes):
+                    raise HttpError(405, f"metode {method} tidak didukung")
+                raise HttpError(404, f"{path} tidak ditemukan")
+            if self.active >= self.max_concurrency:
+                raise HttpError(503, "server sibuk, coba lagi", (('Retry-After', '1'),))
+            self.active += 1
+            try:
+                payload = {}
+                if body:
+                    try:
+                        payload = json.loads(body)
+                    except ValueError:
+                        raise HttpError(400, "body bukan JSON yang valid") from None
+                    if not isinstance(payload, dict):
+                        raise HttpError(400, "body harus berupa objek JSON")
+                return await handler(payload)
+            finally:
+                self.active -= 1
+        except HttpError as exc:
+            return _error_response(exc)
+        except Exception as exc:  # jangan sampai satu permintaan mematikan koneksi lain
+            return _error_response(HttpError(500, f"{type(exc).__name__}: {exc}"))
+
+    async def serve(self, host='127.0.0.1', port=8080, ready=None):
+        # Bukan fork: proses worker tidak boleh mewarisi socket server dan koneksi
+        # klien, kalau tidak klien ``Connection: close`` tidak pernah menerima EOF
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+        server = await asyncio.start_server(self.handle_connection, host, port,
+                                            backlog=self.max_concurrency)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        try:
+            async with server:
+                if ready is not None:
+                    ready(server.sockets[0].getsockname()[1])
+                await stop.wait()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def content_disposition(name, tanggal):
+    """Header ``Content-Disposition`` unduhan PDF untuk ``name``.
+
+    ``filename`` ASCII dari :func:`akta.pdf.safe_filename`, ditambah
+    ``filename*`` UTF-8 (RFC 5987) yang mempertahankan nama asli; keduanya
+    tidak pernah berisi CR/LF atau tanda kutip.
+    """
+    original = f"AKTA_{'_'.join(name.split())}_{tanggal.strftime('%Y%m%d')}.pdf"
+    return (f'attachment; filename="{safe_filename(name, tanggal)}"; '
+            f"filename*=UTF-8''{quote(original, safe='')}")
+
+
+def _json_response(obj, status=200):
+    data = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+    return status, data, (('Content-Type', 'application/json; charset=utf-8'),)
+
+
+def _error_response(exc):
+    status, data, headers = _json_response({'error': str(exc)}, exc.status)
+    return status, data, headers + tuple(exc.headers)
+
+
+def _encode_response(status, data, headers, keep_alive=True):
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+             f"Content-Length: {len(data)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    for key, value in headers:
+        if '\r' in value or '\n' in value:
+            raise ValueError(f"header {key} berisi baris baru")
+        lines.append(f"{key}: {value}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + data
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(400, "baris permintaan tidak valid") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= _MAX_HEADERS:
+            raise HttpError(400, "terlalu banyak header")
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+    if 'transfer-encoding' in headers:
+        raise HttpError(411, "gunakan Content-Length, bukan chunked")
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HttpError(400, "Content-Length tidak valid") from None
+    if length > MAX_BODY:
+        raise HttpError(413, f"body melebihi {MAX_BODY:,} byte")
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m akta.server',
+        description="Layanan HTTP AKTA: anggaran, anggaran batch, dan laporan PDF.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="jumlah proses render PDF (bawaan: jumlah core CPU)")
+    parser.add_argument('--max-concurrency', type=int, default=256,
+                        help="permintaan yang diproses bersamaan sebelum dijawab 503")
+    parser.add_argument('--max-pending-pdf', type=int, default=None,
+                        help="PDF yang dirender/menunggu sebelum dijawab 503 (bawaan: 4 per worker)")
+    args = parser.parse_args(argv)
+
+    server = AktaServer(args.workers, args.max_concurrency, args.max_pending_pdf)
+    asyncio.run(server.serve(
+        args.host, args.port,
+        ready=lambda port: print(f"AKTA melayani di http://{args.host}:{port}", flush=True)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Hasil perhitungan per sesi sebagai satu record kecil yang tidak bisa diubah.
+
+Sesi Streamlit hanya menyimpan satu :class:`BudgetRecord` di
+``st.session_state``. Alokasi dan tabel hasil diambil dari cache bersama per
+proses (:func:`akta.cache.ttl_cache`), sehingga sesi dengan masukan yang sama,
+misalnya nilai bawaan 250 jt + 150 jt, memakai objek yang sama alih-alih
+masing-masing menyimpan dict alokasi sendiri.
+"""
+from collections import namedtuple
+
+from akta.budget import calculate_budget_rupiah, format_idr_bulk, nisab
+from akta.cache import ttl_cache
+from akta.export import export_table
+from akta.money import monthly_amount
+from akta.rules import get_rules
+
+CACHE_SIZE = 4096
+CACHE_TTL = 3600  # detik
+
+# Kolom Persentase pos nisab (zakat) bila total pemasukan di bawah nisab
+TIDAK_WAJIB = "(Tidak wajib, di bawah nisab)"
+
+
+@ttl_cache(CACHE_SIZE, CACHE_TTL)
+def budget_values(total_income, program='standar', harga_emas=None):
+    """Alokasi rupiah bulat (:func:`~akta.budget.calculate_budget_rupiah`) sebagai tuple.
+
+    Urutannya sama dengan ``get_rules(program).keys``.
+    """
+    allocations = calculate_budget_rupiah(total_income, program, harga_emas)
+    return tuple(allocations[key] for key in get_rules(program).keys)
+
+
+@ttl_cache(CACHE_SIZE, CACHE_TTL)
+def results_table(total_income, program='standar', harga_emas=None):
+    """Kolom tabel Pengeluaran Tahunan yang sudah diformat, sebagai tuple ``(judul, nilai)``."""
+    rules = get_rules(program)
+    allocations = dict(zip(rules.keys, budget_values(total_income, program, harga_emas)))
+    rows = rules.rows
+    # Nominal tahunan dan bulanan diformat sekaligus
+    jumlah = format_idr_bulk([allocations[r.key] for r in rows] +
+                             [monthly_amount(allocations[r.key]) for r in rows])
+    dibawah_nisab = harga_emas is not None and total_income < nisab(harga_emas)
+    return (
+        ("Pos Pengeluaran", tuple(r.ui_label for r in rows)),
+        ("Persentase", tuple(TIDAK_WAJIB if dibawah_nisab and r.nisab else r.ui_pct
+                             for r in rows)),
+        ("Jumlah Tahunan", tuple(jumlah[:len(rows)])),
+        ("Jumlah Bulanan", tuple(jumlah[len(rows):])),
+    )
+
+
+@ttl_cache(CACHE_SIZE, CACHE_TTL)
+def export_bytes(total_income, program='standar', harga_emas=None, fmt='csv'):
+    """Tabel hasil sebagai bytes CSV/JSON/XLSX (:func:`akta.export.export_table`)."""
+    rules = get_rules(program)
+    allocations = dict(zip(rules.keys, budget_values(total_income, program, harga_emas)))
+    return export_table(allocations, rules, fmt)
+
+
+class BudgetRecord(namedtuple('BudgetRecord', 'nama usia tetap tidak_tetap harga_emas program alokasi')):
+    """Masukan dan hasil satu perhitungan; ``alokasi`` tuple bersama dari :func:`budget_values`."""
+
+    __slots__ = ()
+
+    @property
+    def total_pemasukan(self):
+        return self.tetap + self.tidak_tetap
+
+    @property
+    def rules(self):
+        return get_rules(self.program)
+
+    @property
+    def allocations(self):
+        """Alokasi sebagai dict baru (aman diubah pemanggil)."""
+        return dict(zip(self.rules.keys, self.alokasi))
+
+    def table(self):
+        """Data tabel hasil untuk ``st.dataframe`` (dari cache bersama)."""
+        return dict(results_table(self.total_pemasukan, self.program, self.harga_emas))
+
+    def export(self, fmt):
+        """Tabel hasil sebagai bytes ``fmt`` ('csv', 'json', 'xlsx'), dari cache bersama."""
+        return export_bytes(self.total_pemasukan, self.program, self.harga_emas, fmt)
+
+
+def budget_record(nama, usia, tetap, tidak_tetap, harga_emas, program='standar'):
+    """Hitung (atau ambil dari cache) alokasi lalu bungkus sebagai :class:`BudgetRecord`."""
+    return BudgetRecord(nama, usia, tetap, tidak_tetap, harga_emas, program,
+                        budget_values(tetap + tidak_tetap, program, harga_emas))
@@ -0,0 +1,113 @@
+"""Simulasi "bagaimana jika" pemasukan dari kisi anggaran yang dihitung sekali.
+
+Untuk satu masukan, semua alokasi pada rentang pemasukan di sekitarnya
+dihitung sekaligus secara vektor (:meth:`akta.rules.RuleSet.evaluate_rupiah`)
+dan disimpan di cache bersama per proses. Menggeser slider hanya mengambil
+satu kolom kisi, tanpa menghitung ulang anggaran, tabel hasil, atau PDF::
+
+    kisi = budget_grid(400_000_000, 2_800_000)
+    i = kisi.index(400_000_000)
+    kisi.at(i)['dana_masa_depan']   # == calculate_budget_rupiah(400_000_000, ...)
+
+Aturan alokasi saat ini hanya bergantung pada total pemasukan (dan nisab), jadi
+kisinya satu dimensi atas total; porsi tetap : tidak tetap cukup membagi total
+yang dipilih (:func:`split_income`). Data grafiknya juga di-cache per masukan
+sebagai tabel Arrow (:func:`grid_chart`), sehingga rerun tidak membangun ulang
+baris grafik kisi.
+"""
+import bisect
+import math
+from collections import namedtuple
+
+from akta.budget import format_idr_bulk
+from akta.cache import ttl_cache
+from akta.rules import get_rules
+
+GRID_POINTS = 200   # jumlah langkah kisi (kurang lebih, langkah dibulatkan)
+GRID_RANGE = (0.5, 2.0)  # rentang kisi relatif terhadap pemasukan saat ini
+GRID_CACHE_SIZE = 256
+GRID_CACHE_TTL = 3600  # detik
+
+
+def _nice_step(span, points):
+    # Langkah 1, 2 atau 5 x 10^k terkecil yang membagi ``span`` menjadi <= ``points`` bagian
+    raw = max(span / points, 1)
+    base = 10 ** math.floor(math.log10(raw))
+    return next(m * base for m in (1, 2, 5, 10) if m * base >= raw)
+
+
+def income_grid(total_income, points=GRID_POINTS, span=GRID_RANGE):
+    """Titik kisi pemasukan: kelipatan langkah bulat di sekitar ``total_income``, plus nilainya sendiri."""
+    total_income = int(total_income)
+    low, high = span[0] * total_income, span[1] * total_income
+    step = _nice_step(high - low, points)
+    first = max(step, math.floor(low / step) * step)
+    last = max(first, math.ceil(high / step) * step)
+    return tuple(sorted(set(range(first, last + 1, step)) | {total_income}))
+
+
+def split_income(total_income, porsi_tetap):
+    """Bagi ``total_income`` menjadi ``(tetap, tidak_tetap)`` dengan porsi tetap ``porsi_tetap`` persen."""
+    tetap = total_income * porsi_tetap // 100
+    return tetap, total_income - tetap
+
+
+class BudgetGrid(namedtuple('BudgetGrid', 'program pemasukan label nilai')):
+    """Alokasi rupiah bulat untuk setiap titik ``pemasukan``.
+
+    ``nilai`` array ``int64`` (pos x titik) baca-saja dengan urutan pos
+    ``get_rules(program).keys``; ``label`` pemasukan yang sudah diformat.
+    """
+
+    __slots__ = ()
+
+    @property
+    def rules(self):
+        return get_rules(self.program)
+
+    def index(self, total_income):
+        """Indeks titik kisi terdekat (ke bawah) untuk ``total_income``."""
+        i = bisect.bisect_right(self.pemasukan, total_income) - 1
+        return min(max(i, 0), len(self.pemasukan) - 1)
+
+    def at(self, i):
+        """Alokasi pada titik ``i`` sebagai dict ``pos -> int``."""
+        return dict(zip(self.rules.keys, self.nilai[:, i].tolist()))
+
+    def chart_values(self):
+        """Satu baris per titik kisi untuk grafik: ``Pemasukan`` lalu label setiap pos."""
+        rows = self.rules.rows
+        keys = self.rules.keys
+        series = [self.nilai[keys.index(r.key)].tolist() for r in rows]
+        return [dict(zip(('Pemasukan',) + tuple(r.label for r in rows), values))
+                for values in zip(self.pemasukan, *series)]
+
+
+@ttl_cache(GRID_CACHE_SIZE, GRID_CACHE_TTL)
+def budget_grid(total_income, harga_emas=None, program='standar'):
+    """Kisi anggaran di sekitar ``total_income`` (:func:`income_grid`), dihitung sekali per masukan."""
+    import numpy as np
+
+    rules = get_rules(program)
+    pemasukan = income_grid(total_income)
+    allocations = rules.evaluate_rupiah(np.array(pemasukan, dtype=np.int64), harga_emas)
+    nilai = np.stack([allocations[key] for key in rules.keys])
+    nilai.flags.writeable = False  # dibagikan ke semua sesi
+    return BudgetGrid(program, pemasukan, tuple(format_idr_bulk(pemasukan)), nilai)
+
+
+@ttl_cache(GRID_CACHE_SIZE, GRID_CACHE_TTL)
+def grid_chart(total_income, harga_emas=None, program='standar'):
+    """:meth:`BudgetGrid.chart_values` sebagai tabel ``pyarrow``, dibuat sekali per masukan.
+
+    ``st.vega_lite_chart`` mengirim tabel Arrow apa adanya, tanpa konversi
+    list -> pandas -> Arrow di setiap rerun.
+    """
+    import pyarrow as pa
+
+    kisi = budget_grid(total_income, harga_emas, program)
+    keys = kisi.rules.keys
+    columns = {'Pemasukan': pa.array(kisi.pemasukan, pa.int64())}
+    for r in kisi.rules.rows:
+        columns[r.label] = pa.array(kisi.nilai[keys.index(r.key)])
+    return pa.table(columns)
@@ -0,0 +1,50 @@
+"""Bandingkan calculate_budget_batch dengan loop calculate_budget skalar.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_budget_batch --n 300000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from akta.budget import POS_KEYS, calculate_budget, calculate_budget_batch
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=300_000, help='jumlah rumah tangga')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    incomes = rng.integers(0, 5_000_000_000, size=args.n)
+    incomes_list = incomes.tolist()
+
+    t_loop, scalar = _best_of(lambda: [calculate_budget(x) for x in incomes_list], args.repeat)
+    t_batch, batch = _best_of(lambda: calculate_budget_batch(incomes), args.repeat)
+
+    for key in POS_KEYS:
+        expected = np.fromiter((row[key] for row in scalar), dtype=np.float64, count=args.n)
+        if not np.array_equal(expected, batch[key]):
+            raise SystemExit(f"hasil batch berbeda dari skalar pada pos {key!r}")
+
+    print(f"rumah tangga     : {args.n:,}")
+    print(f"loop skalar      : {t_loop * 1e3:10.1f} ms")
+    print(f"batch (NumPy)    : {t_batch * 1e3:10.1f} ms")
+    print(f"percepatan       : {t_loop / t_batch:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
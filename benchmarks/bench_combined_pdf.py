@@ -0,0 +1,56 @@
+"""Ukur halaman/detik dan RSS puncak PDF gabungan untuk berbagai jumlah rumah tangga.
+
+Setiap ukuran dijalankan di subprocess tersendiri supaya RSS puncaknya
+(``ru_maxrss``) tidak tercampur; hasilnya ditulis ke file sementara. RSS
+seharusnya datar berapa pun jumlah laporannya. Jalankan dari root repo::
+
+    python -m benchmarks.bench_combined_pdf --sizes 100 1000 10000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = '''
+import json, os, resource, sys, tempfile, time
+from datetime import date
+from akta.combined import write_combined_pdf
+
+n = int(sys.argv[1])
+rows = ({'nama': f'Anggota {i:06d}', 'usia': 25 + i % 40,
+         'tetap': 50_000_000 + (i * 7_919_993) % 900_000_000, 'tidak_tetap': (i % 7) * 10_000_000,
+         'harga_emas': 2_800_000} for i in range(n))
+fd, path = tempfile.mkstemp(suffix='.pdf')
+os.close(fd)
+try:
+    start = time.perf_counter()
+    reports, pages = write_combined_pdf(rows, path, tanggal=date(2026, 1, 31))
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+finally:
+    os.remove(path)
+print(json.dumps({'pages': pages, 'seconds': elapsed, 'bytes': size,
+                  'rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+'''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000],
+                        help='jumlah rumah tangga per percobaan')
+    args = parser.parse_args(argv)
+
+    print(f"{'rumah tangga':>13}{'halaman':>10}{'halaman/detik':>15}{'ukuran MiB':>12}{'RSS puncak MiB':>16}")
+    for n in args.sizes:
+        out = subprocess.run([sys.executable, '-c', _CHILD, str(n)], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        r = json.loads(out)
+        print(f"{n:>13,}{r['pages']:>10,}{r['pages'] / r['seconds']:>15,.1f}"
+              f"{r['bytes'] / 2**20:>12.1f}{r['rss_kib'] / 1024:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
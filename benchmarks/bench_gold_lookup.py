@@ -0,0 +1,80 @@
+"""Bandingkan pencarian harga emas vektor dengan pencarian per baris.
+
+Membuat riwayat harga harian sintetis (CSV dan ``.npy``) di direktori
+sementara, lalu mencari harga untuk ``--n`` pasangan (tanggal, pemasukan) dan
+menghitung alokasinya dengan cek nisab sekaligus. Jalankan dari root repo::
+
+    python -m benchmarks.bench_gold_lookup --n 1000000
+"""
+import argparse
+import bisect
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from akta.budget import calculate_budget_batch
+from akta.gold import GoldPriceHistory
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _write_history(path, rng, years):
+    days = np.arange(np.datetime64('2000-01-01'), np.datetime64('2000-01-01') + 365 * years)
+    prices = np.round(150_000 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, size=days.size))))
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write('tanggal,harga_emas\n')
+        fh.writelines(f"{d},{p:.0f}\n" for d, p in zip(days.astype(str), prices))
+    return days
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=1_000_000, help='jumlah pasangan (tanggal, pemasukan)')
+    parser.add_argument('--years', type=int, default=25, help='panjang riwayat harga harian')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, npy_path = os.path.join(tmp, 'harga_emas.csv'), os.path.join(tmp, 'harga_emas.npy')
+        days = _write_history(csv_path, rng, args.years)
+
+        t_csv, history = _best_of(lambda: GoldPriceHistory.from_csv(csv_path), 1)
+        history.save(npy_path)
+        t_npy, mapped = _best_of(lambda: GoldPriceHistory.load(npy_path), args.repeat)
+
+        dates = rng.choice(days, size=args.n)
+        incomes = rng.integers(0, 1_000_000_000, size=args.n)
+
+        keys, values = history.days.tolist(), history.prices.tolist()
+        date_days = dates.astype(np.int64).tolist()
+        t_loop, expected = _best_of(
+            lambda: [values[bisect.bisect_right(keys, d) - 1] for d in date_days], 1)
+        t_vec, prices = _best_of(lambda: mapped.prices_on(dates), args.repeat)
+        if not np.array_equal(prices, np.asarray(expected)):
+            raise SystemExit("hasil pencarian vektor berbeda dari pencarian per baris")
+        t_budget, _ = _best_of(lambda: calculate_budget_batch(incomes, harga_emas=prices),
+                               args.repeat)
+
+    print(f"riwayat harga    : {len(history):,} hari")
+    print(f"baca CSV         : {t_csv * 1e3:10.1f} ms")
+    print(f"buka .npy (mmap) : {t_npy * 1e3:10.3f} ms")
+    print(f"pencarian        : {args.n:,} tanggal")
+    print(f"per baris        : {t_loop * 1e3:10.1f} ms")
+    print(f"vektor           : {t_vec * 1e3:10.1f} ms")
+    print(f"percepatan       : {t_loop / t_vec:10.1f}x")
+    print(f"alokasi + nisab  : {t_budget * 1e3:10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Bandingkan alokasi rupiah bulat int64 (akta.money) dengan implementasi ``decimal.Decimal``.
+
+Keduanya memakai metode sisa terbesar yang sama, termasuk pemecahan setiap pos
+menjadi 12 bulan; hasilnya diperiksa identik. Jalankan dari root repo::
+
+    python -m benchmarks.bench_money --n 200000
+"""
+import argparse
+import time
+from decimal import ROUND_FLOOR, Decimal
+
+import numpy as np
+
+from akta.budget import calculate_budget_rupiah
+from akta.money import split_monthly
+from akta.rules import get_rules
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _decimal_allocate(total, weights):
+    denom = Decimal(sum(weights))
+    exact = [total * w / denom for w in weights]
+    quotas = [q.to_integral_value(ROUND_FLOOR) for q in exact]
+    order = sorted(range(len(weights)), key=lambda i: -(exact[i] - quotas[i]))
+    for i in order[:int(total - sum(quotas))]:
+        quotas[i] += 1
+    return quotas
+
+
+def _decimal_budget(incomes, plan):
+    keys, weights, _, subs = plan
+    rows = []
+    for income in incomes:
+        total = Decimal(income)
+        parts = _decimal_allocate(total, weights)
+        row = {}
+        for i, key in enumerate(keys):
+            if i in subs:
+                sub_keys, sub_weights = subs[i]
+                row.update(zip(sub_keys, _decimal_allocate(parts[i], sub_weights)))
+            row[key] = parts[i]
+        row = {key: (value, [value // 12 + (m < value % 12) for m in range(12)])
+               for key, value in row.items()}
+        rows.append(row)
+    return rows
+
+
+def _int64_budget(incomes):
+    allocations = calculate_budget_rupiah(incomes)
+    return {key: (value, split_monthly(value)) for key, value in allocations.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=200_000, help='jumlah rumah tangga')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    incomes = rng.integers(0, 5_000_000_000, size=args.n)
+    incomes_list = incomes.tolist()
+    plan = get_rules()._plan
+
+    t_decimal, reference = _best_of(lambda: _decimal_budget(incomes_list, plan), 1)
+    t_scalar, _ = _best_of(lambda: [calculate_budget_rupiah(x) for x in incomes_list], args.repeat)
+    t_batch, batch = _best_of(lambda: _int64_budget(incomes), args.repeat)
+
+    for key in reference[0]:
+        annual = np.fromiter((int(row[key][0]) for row in reference), dtype=np.int64, count=args.n)
+        monthly = np.array([[int(m) for m in row[key][1]] for row in reference], dtype=np.int64)
+        if not (np.array_equal(annual, batch[key][0]) and np.array_equal(monthly, batch[key][1])):
+            raise SystemExit(f"hasil int64 berbeda dari Decimal pada pos {key!r}")
+        if not (batch[key][1].sum(axis=1) == batch[key][0]).all():
+            raise SystemExit(f"12 bulan pos {key!r} tidak sama dengan tahunan")
+
+    print(f"rumah tangga          : {args.n:,}")
+    print(f"Decimal (loop)        : {t_decimal * 1e3:10.1f} ms")
+    print(f"int Python (loop)*    : {t_scalar * 1e3:10.1f} ms")
+    print(f"int64 NumPy (batch)   : {t_batch * 1e3:10.1f} ms")
+    print(f"percepatan vs Decimal : {t_decimal / t_batch:10.1f}x")
+    print("* tanpa pemecahan 12 bulan")
+
+
+if __name__ == '__main__':
+    main()
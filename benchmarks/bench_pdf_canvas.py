@@ -0,0 +1,106 @@
+"""Bandingkan mesin PDF ``canvas`` dengan ``platypus``: kecepatan dan hasil visual.
+
+Untuk beberapa laporan contoh (surplus, defisit, dengan proyeksi, nama dengan
+spasi ganda, dan kasus yang sengaja jatuh ke platypus: nama sangat panjang,
+nama bermarkup, nominal sangat besar) setiap mesin diukur bergantian, lalu
+kedua PDF dirasterisasi dengan PyMuPDF (``pip install pymupdf``) dan
+dibandingkan per piksel, ditambah teks, posisi, font dan warna setiap span.
+Proses keluar dengan kode 1 bila ada perbedaan. Jalankan dari root repo::
+
+    python -m benchmarks.bench_pdf_canvas --n 100 --dpi 150
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import date
+
+from akta.budget import calculate_budget_rupiah
+from akta.pdf import generate_pdf, generate_pdf_canvas
+from akta.projection import project_summary
+
+
+def _cases():
+    tanggal = date(2026, 1, 31)
+    surplus = calculate_budget_rupiah(400_000_000, None, 2_800_000)
+    defisit = dict(surplus, surplus_defisit=-12_500_000)
+    besar = calculate_budget_rupiah(10 ** 16, None, 2_800_000)
+    proyeksi = project_summary(400_000_000, 2_800_000, 20, paths=2_000).every(5)
+    report = ('Budi Santoso', 35, 250_000_000, 150_000_000, 400_000_000, 2_800_000)
+    return [
+        ('surplus', report + (surplus, tanggal), {}),
+        ('defisit', report + (defisit, tanggal), {}),
+        ('proyeksi', report + (surplus, tanggal), {'proyeksi': proyeksi}),
+        ('nama  spasi ganda', ('  Siti   Aminah ',) + report[1:] + (surplus, tanggal), {}),
+        ('nama panjang (platypus)', ('Raden Mas ' * 12,) + report[1:] + (surplus, tanggal), {}),
+        ('nama markup (platypus)', ('Budi & Ani',) + report[1:] + (surplus, tanggal), {}),
+        ('nominal besar (platypus)', ('Budi Santoso', 35, 10 ** 16, 0, 10 ** 16, 2_800_000,
+                                      besar, tanggal), {}),
+    ]
+
+
+def _median_ms(fn, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def _spans(page):
+    return sorted((span['text'], tuple(round(v, 2) for v in span['bbox']), span['font'],
+                   span['color'])
+                  for block in page.get_text('dict')['blocks']
+                  for line in block.get('lines', ()) for span in line['spans'])
+
+
+def visual_diff(pdf_a, pdf_b, dpi=150):
+    """Bandingkan dua PDF; kembalikan ``(piksel berbeda, span berbeda)`` (0, 0 bila sama)."""
+    try:
+        import pymupdf
+    except ImportError:
+        sys.exit("visual diff membutuhkan PyMuPDF: pip install pymupdf")
+    import numpy as np
+
+    a, b = pymupdf.open(stream=pdf_a), pymupdf.open(stream=pdf_b)
+    if len(a) != len(b):
+        return float('inf'), abs(len(a) - len(b))
+    pixels = spans = 0
+    for page_a, page_b in zip(a, b):
+        img_a = np.frombuffer(page_a.get_pixmap(dpi=dpi).samples, np.uint8)
+        img_b = np.frombuffer(page_b.get_pixmap(dpi=dpi).samples, np.uint8)
+        pixels += int((img_a != img_b).sum()) if img_a.shape == img_b.shape else img_a.size
+        spans += len(set(_spans(page_a)) ^ set(_spans(page_b)))
+    return pixels, spans
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=100, help='laporan per mesin per kasus')
+    parser.add_argument('--dpi', type=int, default=150, help='resolusi rasterisasi visual diff')
+    args = parser.parse_args(argv)
+
+    print(f"{'kasus':<26}{'platypus ms':>12}{'canvas ms':>11}{'lebih cepat':>13}"
+          f"{'piksel beda':>13}{'span beda':>11}")
+    failed = False
+    for label, report, kwargs in _cases():
+        platypus = generate_pdf(*report, **kwargs).getvalue()  # pemanasan + tata letak direkam
+        canvas = generate_pdf_canvas(*report, **kwargs).getvalue()
+        t_platypus = t_canvas = 0.0
+        for _ in range(2):  # bergantian agar derau terbagi rata ke kedua mesin
+            t_platypus += _median_ms(lambda: generate_pdf(*report, **kwargs), args.n) / 2
+            t_canvas += _median_ms(lambda: generate_pdf_canvas(*report, **kwargs), args.n) / 2
+        pixels, spans = visual_diff(platypus, canvas, args.dpi)
+        failed |= bool(pixels or spans)
+        print(f"{label:<26}{t_platypus:>12.2f}{t_canvas:>11.2f}{t_platypus / t_canvas:>12.1f}x"
+              f"{pixels:>13}{spans:>11}")
+    if failed:
+        print("hasil mesin canvas berbeda dari platypus")
+        return 1
+    print("hasil visual identik untuk semua kasus")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
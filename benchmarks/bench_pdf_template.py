@@ -0,0 +1,70 @@
+"""Ukur penghematan per laporan dari template PDF yang dibangun sekali.
+
+Membandingkan ``generate_pdf`` dengan template baru di setiap panggilan
+(perilaku lama: gaya, TableStyle dan flowable statis dibangun ulang) dan
+dengan template bersama. Jalankan dari root repo::
+
+    python -m benchmarks.bench_pdf_template --n 200
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+
+from akta.budget import calculate_budget
+from akta.pdf import PdfTemplate, generate_pdf, get_template
+
+
+def _timings(fn, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _interleaved(fn_a, fn_b, n):
+    # Bergantian agar derau (GC, frekuensi CPU) terbagi rata ke kedua mode
+    a, b = [], []
+    for _ in range(n):
+        a.extend(_timings(fn_a, 1))
+        b.extend(_timings(fn_b, 1))
+    return a, b
+
+
+def _report(label, samples):
+    ms = [s * 1e3 for s in samples]
+    print(f"{label:<32}: median {statistics.median(ms):8.3f} ms, "
+          f"min {min(ms):8.3f} ms")
+    return statistics.median(ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=200, help='jumlah laporan per mode')
+    args = parser.parse_args(argv)
+
+    tanggal = date(2026, 1, 31)
+    allocations = calculate_budget(400_000_000)
+    report = ('Budi Santoso', 35, 250_000_000, 150_000_000, 400_000_000, 2_800_000, allocations)
+    template = get_template()
+    generate_pdf(*report, tanggal)  # pemanasan: font, cache ReportLab
+
+    print(f"laporan per mode: {args.n}")
+    t_tpl = _report("bangun template", _timings(PdfTemplate, args.n))
+    t_story = _report("susun story (template)",
+                      _timings(lambda: template.build_story(*report, tanggal), args.n))
+    old, new = _interleaved(
+        lambda: generate_pdf(*report, tanggal, template=PdfTemplate()),
+        lambda: generate_pdf(*report, tanggal),
+        args.n)
+    t_old = _report("generate_pdf, template baru", old)
+    t_new = _report("generate_pdf, template bersama", new)
+    print(f"{'hemat per laporan':<32}: {t_old - t_new:8.3f} ms "
+          f"({(t_old - t_new) / t_old:.1%}); template sendiri {t_tpl:.3f} ms, "
+          f"story {t_story:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
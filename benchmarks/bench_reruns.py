@@ -0,0 +1,101 @@
+"""Jumlah rerun dan CPU server per sesi untuk satu kunjungan khas ke AKTA.py.
+
+Menjalankan server Streamlit sungguhan lalu ``--sessions`` sesi berurutan lewat
+:class:`benchmarks.streamlit_client.Session`, masing-masing mengisi semua
+masukan, menghitung, meminta dan menunggu PDF, mengubah proyeksi empat kali lalu
+mengganti nama dan pemasukan untuk hitung ulang. Dilaporkan jumlah run penuh,
+run fragmen dan milidetik CPU proses server per sesi (dari ``/proc``, Linux),
+juga per tahap (mengisi form, hitung + PDF, proyeksi + PDF).
+
+Bandingkan dengan versi lain skrip memakai ``--script``, misalnya versi
+sebelum form dan fragmen::
+
+    git show fd6ec4d:AKTA.py > /tmp/AKTA_lama.py
+    python -m benchmarks.bench_reruns --script /tmp/AKTA_lama.py
+    python -m benchmarks.bench_reruns
+"""
+import argparse
+import asyncio
+import os
+from collections import Counter
+
+from benchmarks.streamlit_client import ROOT, Session, process_cpu, start_server
+
+HITUNG = '🧮 Hitung Anggaran'
+PDF = '📥 Download PDF'
+SIAPKAN = '📄 Siapkan Laporan PDF'
+TAHAP = ('isi form', 'hitung + PDF', 'proyeksi + PDF')
+
+
+async def kunjungan(port, pid, nomor=0):
+    """Satu sesi; kembalikan ``(Counter jenis run, Counter detik CPU server per tahap)``."""
+    cpu = Counter()
+    async with await Session.connect(port) as sesi:
+        await sesi.open()
+        mulai = process_cpu(pid)
+
+        def tahap(nama):
+            nonlocal mulai
+            sekarang = process_cpu(pid)
+            cpu[nama] += sekarang - mulai
+            mulai = sekarang
+
+        # Mengisi form satu per satu seperti pengguna
+        await sesi.set('Nama', f'Budi Santoso {nomor}')
+        await sesi.set('Usia', 35)
+        await sesi.set('Tetap (Rp)', 240_000_000)
+        await sesi.set('Tidak Tetap (Rp)', 90_000_000 + nomor * 1_000_000)
+        await sesi.set('Harga Per Gram Emas Saat Ini (Rp)', 2_750_000)
+        tahap('isi form')
+        await sesi.click(HITUNG)
+        await sesi.click(SIAPKAN)
+        await sesi.wait_for(PDF)
+        tahap('hitung + PDF')
+        # Mengatur proyeksi
+        await sesi.set('Jangka Waktu Proyeksi (tahun)', 25)
+        await sesi.set('Jangka Waktu Proyeksi (tahun)', 15)
+        await sesi.set('Inflasi (%)', 4.0)
+        await sesi.set('Sertakan proyeksi di laporan PDF', False)
+        await sesi.click(SIAPKAN)
+        await sesi.wait_for(PDF)
+        tahap('proyeksi + PDF')
+        # Memperbaiki masukan lalu hitung ulang
+        await sesi.set('Nama', f'Budi Santoso, S.E. {nomor}')
+        await sesi.set('Tetap (Rp)', 260_000_000)
+        tahap('isi form')
+        await sesi.click(HITUNG)
+        await sesi.click(SIAPKAN)
+        await sesi.wait_for(PDF)
+        tahap('hitung + PDF')
+        return sesi.runs, cpu
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--script', default=os.path.join(ROOT, 'AKTA.py'))
+    parser.add_argument('--sessions', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    server, port = start_server(os.path.abspath(args.script))
+    try:
+        asyncio.run(kunjungan(port, server.pid, -1))  # pemanasan: impor, font, cache bersama
+        runs, cpu = Counter(), Counter()
+        for nomor in range(args.sessions):
+            sesi_runs, sesi_cpu = asyncio.run(kunjungan(port, server.pid, nomor))
+            runs += sesi_runs
+            cpu += sesi_cpu
+    finally:
+        server.terminate()
+        server.wait()
+
+    n = args.sessions
+    print(f"skrip: {os.path.relpath(args.script, ROOT)}, {n} sesi")
+    for jenis in ('penuh', 'fragmen', 'terpotong'):
+        print(f"{'run ' + jenis + '/sesi':<28}{runs[jenis] / n:>8.1f}")
+    for nama in TAHAP:
+        print(f"{'CPU ' + nama + ' ms/sesi':<28}{cpu[nama] / n * 1e3:>8.0f}")
+    print(f"{'CPU total ms/sesi':<28}{sum(cpu.values()) / n * 1e3:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Uji beban lokal untuk layanan HTTP AKTA (``akta.server``).
+
+Menjalankan server di subprocess pada port acak, lalu membuka ``--connections``
+koneksi keep-alive yang masing-masing mengirim permintaan berurutan selama
+``--duration`` detik per skenario. Dilaporkan permintaan/detik serta latensi
+p50/p99 untuk respons JSON dan PDF, termasuk jumlah 503 (backpressure).
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_server --connections 32 --duration 5 --workers 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'anggaran': ('/anggaran', {'tetap': 250_000_000, 'tidak_tetap': 150_000_000,
+                               'harga_emas': 2_800_000}),
+    'anggaran_batch': ('/anggaran/batch', {'pemasukan': list(range(100_000_000, 101_000_000, 1_000)),
+                                           'harga_emas': 2_800_000}),
+    # Nama berbeda per permintaan supaya cache PDF tidak membuat render gratis
+    'pdf': ('/pdf', {'nama': 'Budi Santoso', 'usia': 35, 'tetap': 250_000_000,
+                     'tidak_tetap': 150_000_000, 'harga_emas': 2_800_000,
+                     'tanggal': '2026-01-31'}),
+}
+
+
+async def _request(reader, writer, path, body):
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        key, _, value = line.decode().partition(':')
+        if key.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(port, path, payload, deadline, unique, latencies, statuses, client):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    n = 0
+    try:
+        while time.perf_counter() < deadline:
+            if unique:
+                payload = dict(payload, nama=f"Anggota {client}-{n}-{deadline}")
+                n += 1
+            body = json.dumps(payload).encode()
+            start = time.perf_counter()
+            status = await _request(reader, writer, path, body)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            elif status == 503:
+                await asyncio.sleep(0.01)  # klien sopan mundur sejenak saat server sibuk
+    finally:
+        writer.close()
+
+
+async def _run_scenario(port, name, connections, duration):
+    path, payload = SCENARIOS[name]
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(port, path, payload, deadline, name == 'pdf', latencies, statuses, i)
+        for i in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def pick(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3 if latencies else 0.0
+
+    return len(latencies) / elapsed, pick(0.50), pick(0.99), statuses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5.0, help='detik per skenario')
+    parser.add_argument('--workers', type=int, default=None, help='proses render PDF di server')
+    parser.add_argument('--max-pending-pdf', type=int, default=None)
+    parser.add_argument('-k', dest='keyword', default='', help='hanya skenario yang memuat teks ini')
+    args = parser.parse_args(argv)
+
+    cmd = [sys.executable, '-m', 'akta.server', '--port', '0']
+    if args.workers:
+        cmd += ['--workers', str(args.workers)]
+    if args.max_pending_pdf:
+        cmd += ['--max-pending-pdf', str(args.max_pending_pdf)]
+    server = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline().rsplit(':', 1)[1])
+        print(f"{'skenario':<16}{'req/detik':>11}{'p50 ms':>10}{'p99 ms':>10}  status")
+        for name in SCENARIOS:
+            if args.keyword not in name:
+                continue
+            asyncio.run(_run_scenario(port, name, args.connections, 0.5))  # pemanasan
+            rps, p50, p99, statuses = asyncio.run(
+                _run_scenario(port, name, args.connections, args.duration))
+            print(f"{name:<16}{rps:>11,.1f}{p50:>10.2f}{p99:>10.2f}  "
+                  f"{', '.join(f'{k}: {v:,}' for k, v in sorted(statuses.items()))}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Memori ``st.session_state`` per sesi: delapan entri terpisah vs satu BudgetRecord.
+
+Mensimulasikan ``--sessions`` sesi yang masing-masing sudah menekan "Hitung
+Anggaran", lalu mengukur byte yang dialokasikan (tracemalloc) per sesi untuk:
+
+- sebelum: ``calculated``, ``name``, ``age``, ``tetap``, ``tidak_tetap``,
+  ``total_pemasukan``, ``harga_emas``, ``allocations`` (dict float) dan ``program``
+- sesudah: satu ``hasil`` (:class:`akta.session.BudgetRecord`) dengan alokasi
+  dari cache bersama
+
+Skenario: semua sesi memakai nilai bawaan, dan setiap sesi berbeda
+pemasukannya (cache tidak membantu). Skenario berbeda diukur dua kali: dengan
+sesi sebanyak kapasitas cache bersama (setiap sesi ikut membayar satu entri
+cache) dan dengan ``--sessions`` sesi; bila melebihi kapasitas, entri lama
+dikeluarkan sehingga biaya cache tidak lagi terlihat per sesi. Jalankan dari
+root repo::
+
+    python -m benchmarks.bench_session_state --sessions 10000
+"""
+import argparse
+import tracemalloc
+
+from akta.budget import calculate_budget
+from akta.session import CACHE_SIZE, budget_record, budget_values
+
+
+def _before(name, age, tetap, tidak_tetap, harga_emas):
+    state = {}
+    state['calculated'] = True
+    state['name'] = name
+    state['age'] = age
+    state['tetap'] = tetap
+    state['tidak_tetap'] = tidak_tetap
+    state['total_pemasukan'] = tetap + tidak_tetap
+    state['harga_emas'] = harga_emas
+    state['allocations'] = calculate_budget(tetap + tidak_tetap, 'standar', harga_emas)
+    state['program'] = 'standar'
+    return state
+
+
+def _after(name, age, tetap, tidak_tetap, harga_emas):
+    state = {}
+    state['hasil'] = budget_record(name, age, tetap, tidak_tetap, harga_emas, 'standar')
+    return state
+
+
+def _per_session(build, inputs):
+    budget_values.cache_clear()
+    tracemalloc.start()
+    sessions = [build(*args) for args in inputs]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return current / len(inputs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    names = [f"Anggota {i}" for i in range(args.sessions)]
+    berbeda = [(n, 25, 250_000_000 + i * 1_000, 150_000_000, 2_800_000)
+               for i, n in enumerate(names)]
+    scenarios = {
+        'nilai bawaan': [(n, 25, 250_000_000, 150_000_000, 2_800_000) for n in names],
+        f'semua berbeda, {min(args.sessions, CACHE_SIZE):,} sesi': berbeda[:CACHE_SIZE],
+        f'semua berbeda, {args.sessions:,} sesi': berbeda,
+    }
+    print(f"{'skenario':<30}{'sebelum B/sesi':>16}{'sesudah B/sesi':>16}{'hemat':>8}")
+    for label, inputs in scenarios.items():
+        before = _per_session(_before, inputs)
+        after = _per_session(_after, inputs)
+        print(f"{label:<30}{before:>16,.0f}{after:>16,.0f}{1 - after / before:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
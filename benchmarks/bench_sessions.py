@@ -0,0 +1,147 @@
+"""Uji beban sesi Streamlit bersamaan terhadap AKTA.py, hanya lewat localhost.
+
+Menjalankan server Streamlit sungguhan, lalu untuk setiap tingkat
+``--concurrency`` menjalankan sebanyak itu sesi paralel selama ``--duration``
+detik (:class:`benchmarks.streamlit_client.Session`). Setiap sesi membuka
+halaman, mengisi form, menekan "Hitung Anggaran" lalu "Siapkan Laporan PDF",
+menunggu PDF lalu mengunduhnya; selesai satu kunjungan, sesi baru dimulai.
+Nama unik per kunjungan supaya cache PDF tidak membuat render gratis.
+
+Per tingkat dilaporkan kunjungan/detik, latensi rerun p50/p90/p99, waktu
+sampai PDF siap (p50), byte PDF terunduh per detik, CPU server (% satu core)
+dan RSS puncak. Titik jenuh ditandai pada tingkat pertama yang tidak lagi
+menaikkan kunjungan/detik minimal 10%. Jalankan dari root repo::
+
+    python -m benchmarks.bench_sessions --concurrency 1,2,4,8,16 --duration 10
+    python -m benchmarks.bench_sessions --option runner.postScriptGC=false
+
+Klien berjalan di mesin yang sama dengan server dan ikut memakai CPU; di
+mesin dengan sedikit core, titik jenuh yang terukur sedikit lebih rendah.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import time
+
+from websockets.exceptions import WebSocketException
+
+from benchmarks.streamlit_client import ROOT, Session, process_cpu, process_rss, start_server
+
+HITUNG = '🧮 Hitung Anggaran'
+PDF = '📥 Download PDF'
+SIAPKAN = '📄 Siapkan Laporan PDF'
+
+# Kenaikan throughput minimal agar tingkat berikutnya dianggap belum jenuh
+SATURATION_GAIN = 0.10
+
+# Nomor kunjungan unik sepanjang proses, termasuk pemanasan
+_NOMOR = itertools.count()
+
+
+async def kunjungan(port, nama, stats):
+    async with await Session.connect(port) as sesi:
+        await sesi.open()
+        await sesi.set('Nama', nama)
+        await sesi.set('Usia', 35)
+        await sesi.set('Tetap (Rp)', 240_000_000)
+        await sesi.set('Tidak Tetap (Rp)', 90_000_000)
+        start = time.perf_counter()
+        await sesi.click(HITUNG)
+        if PDF not in sesi.seen:
+            await sesi.wait_for(SIAPKAN)
+            await sesi.click(SIAPKAN)
+        await sesi.wait_for(PDF, timeout=120)
+        stats['pdf_siap'].append(time.perf_counter() - start)
+        stats['pdf_bytes'] += len(await sesi.download(PDF))
+        stats['latensi'].extend(sesi.latencies)
+
+
+async def _worker(port, level, worker, deadline, stats):
+    while time.perf_counter() < deadline:
+        try:
+            await kunjungan(port, f"Anggota {level}-{worker}-{next(_NOMOR)}", stats)
+            stats['kunjungan'] += 1
+        except (OSError, TimeoutError, WebSocketException, KeyError) as exc:
+            # KeyError: widget yang dicari tidak ada di halaman (Session.click/set)
+            stats['gagal'] += 1
+            stats['galat'] = repr(exc)
+
+
+async def _sample_rss(pid, stats, stop):
+    while not stop.is_set():
+        stats['rss'] = max(stats['rss'], process_rss(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), 0.2)
+        except TimeoutError:
+            pass
+
+
+async def run_level(server, port, level, duration):
+    """Jalankan ``level`` sesi paralel selama ``duration`` detik; kembalikan statistik."""
+    stats = {'kunjungan': 0, 'gagal': 0, 'galat': None, 'pdf_bytes': 0,
+             'latensi': [], 'pdf_siap': [], 'rss': 0}
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(server.pid, stats, stop))
+    cpu = process_cpu(server.pid)
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(_worker(port, level, i, deadline, stats) for i in range(level)))
+    stats['detik'] = time.perf_counter() - started
+    stats['cpu'] = process_cpu(server.pid) - cpu
+    stop.set()
+    await sampler
+    return stats
+
+
+def _pick(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1e3 if values else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--script', default=os.path.join(ROOT, 'AKTA.py'))
+    parser.add_argument('--concurrency', default='1,2,4,8,16',
+                        help='tingkat sesi paralel, dipisah koma')
+    parser.add_argument('--duration', type=float, default=10.0, help='detik per tingkat')
+    parser.add_argument('--option', action='append', default=[], metavar='NAMA=NILAI',
+                        help='opsi konfigurasi Streamlit untuk server, mis. runner.postScriptGC=false')
+    args = parser.parse_args(argv)
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    options = [part for option in args.option
+               for part in ('--' + option.partition('=')[0], option.partition('=')[2])]
+    server, port = start_server(os.path.abspath(args.script), options=options)
+    try:
+        asyncio.run(run_level(server, port, 1, 2.0))  # pemanasan: impor, font, cache bersama
+        print(f"{'sesi':>5}{'kunj/dtk':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+              f"{'PDF siap':>10}{'PDF KiB/dtk':>13}{'CPU %':>7}{'RSS MiB':>9}{'gagal':>7}")
+        best = 0.0
+        jenuh = None
+        for level in levels:
+            stats = asyncio.run(run_level(server, port, level, args.duration))
+            rate = stats['kunjungan'] / stats['detik']
+            print(f"{level:>5}{rate:>10.2f}{_pick(stats['latensi'], 0.50):>9.1f}"
+                  f"{_pick(stats['latensi'], 0.90):>9.1f}{_pick(stats['latensi'], 0.99):>9.1f}"
+                  f"{_pick(stats['pdf_siap'], 0.50):>10.0f}"
+                  f"{stats['pdf_bytes'] / stats['detik'] / 1024:>13.1f}"
+                  f"{stats['cpu'] / stats['detik'] * 100:>7.0f}{stats['rss'] / 2 ** 20:>9.1f}"
+                  f"{stats['gagal']:>7}")
+            if stats['galat']:
+                print(f"      galat terakhir: {stats['galat']}")
+            if jenuh is None and best and rate < best * (1 + SATURATION_GAIN):
+                jenuh = level
+            best = max(best, rate)
+    finally:
+        server.terminate()
+        server.wait()
+
+    if jenuh is None:
+        print("belum jenuh pada tingkat tertinggi; naikkan --concurrency")
+    else:
+        print(f"titik jenuh: sekitar {jenuh} sesi paralel ({best:.2f} kunjungan/detik)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""Suite benchmark dan regresi untuk jalur panas AKTA.
+
+Setiap kasus diukur berulang untuk distribusi latensi (p50/p90/p99) lalu
+dijalankan sekali lagi di bawah ``tracemalloc`` untuk puncak memori. Hasil
+dibandingkan dengan ``benchmarks/baseline.json``; bila median suatu kasus
+lebih lambat dari baseline melebihi ambang, proses keluar dengan kode 1.
+Median baseline di bawah ``--min-ms`` (bawaan 1 ms) dihitung sebagai
+``--min-ms``: untuk kasus mikrodetik, derau mesin saja sudah melewati 30%,
+jadi kasus itu hanya gagal bila melambat jauh.
+Jalankan dari root repo::
+
+    python -m benchmarks.run                    # bandingkan dengan baseline
+    python -m benchmarks.run --save-baseline    # perbarui baseline
+    python -m benchmarks.run -k pdf --threshold 0.5
+
+Baseline bergantung pada mesin; perbarui di mesin yang sama dengan CI/server.
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.30
+# Median baseline minimal (ms) yang dipakai saat menerapkan ambang
+DEFAULT_MIN_MS = 1.0
+PDF_LABEL = '📥 Download PDF'
+
+CASES = {}
+
+
+def case(name, repeat):
+    """Daftarkan kasus; fungsi yang didekorasi menyiapkan data lalu mengembalikan callable yang diukur."""
+    def register(setup):
+        CASES[name] = (setup, repeat)
+        return setup
+    return register
+
+
+@case('calculate_budget', repeat=200)
+def _calculate_budget():
+    from akta.budget import calculate_budget
+    incomes = [10 ** e + k * 7_919 for e in range(6, 13) for k in range(100)]
+
+    def run():
+        for income in incomes:
+            calculate_budget(income)
+    return run
+
+
+@case('format_idr', repeat=200)
+def _format_idr():
+    from akta.budget import format_idr
+    amounts = [10 ** 15 + k * 123_456_789.5 for k in range(1_000)]
+
+    def run():
+        for amount in amounts:
+            format_idr(amount)
+    return run
+
+
+@case('format_idr_bulk', repeat=200)
+def _format_idr_bulk():
+    from akta.budget import format_idr_bulk
+    amounts = [10 ** 15 + k * 123_456_789.5 for k in range(1_000)]
+
+    def run():
+        format_idr_bulk(amounts)
+    return run
+
+
+@case('pdf_styles', repeat=200)
+def _pdf_styles():
+    from akta._pdf_render import _pdf_styles
+    return _pdf_styles
+
+
+@case('generate_pdf', repeat=50)
+def _generate_pdf():
+    from akta.budget import calculate_budget
+    from akta.pdf import generate_pdf
+    allocations = calculate_budget(400_000_000)
+    tanggal = date(2026, 1, 31)
+
+    def run():
+        generate_pdf('Budi Santoso', 35, 250_000_000, 150_000_000, 400_000_000,
+                     2_800_000, allocations, tanggal)
+    return run
+
+
+@case('generate_pdf_canvas', repeat=50)
+def _generate_pdf_canvas():
+    from akta.budget import calculate_budget
+    from akta.pdf import generate_pdf_canvas
+    allocations = calculate_budget(400_000_000)
+    tanggal = date(2026, 1, 31)
+
+    def run():
+        generate_pdf_canvas('Budi Santoso', 35, 250_000_000, 150_000_000, 400_000_000,
+                            2_800_000, allocations, tanggal)
+    return run
+
+
+def _export(fmt):
+    from akta.budget import calculate_budget_rupiah
+    from akta.export import export_table
+    allocations = calculate_budget_rupiah(400_000_000)
+
+    def run():
+        export_table(allocations, fmt=fmt)
+    return run
+
+
+for _fmt in ('csv', 'json', 'xlsx'):
+    case(f'export_{_fmt}', repeat=200)(lambda fmt=_fmt: _export(fmt))
+
+
+@case('whatif_grid', repeat=200)
+def _whatif_grid():
+    from akta.whatif import budget_grid
+    build = budget_grid.__wrapped__  # tanpa cache: biaya sekali per masukan
+
+    def run():
+        build(400_000_000, 2_800_000)
+    return run
+
+
+@case('whatif_lookup', repeat=200)
+def _whatif_lookup():
+    from akta.whatif import budget_grid, grid_chart
+    grid_chart(400_000_000, 2_800_000)  # isi cache kisi dan grafik
+
+    def run():
+        # Yang dikerjakan satu geseran slider: ambil kisi dari cache, satu kolom, data grafik
+        kisi = budget_grid(400_000_000, 2_800_000)
+        kisi.at(kisi.index(300_000_000))
+        grid_chart(400_000_000, 2_800_000)
+    return run
+
+
+@case('projection', repeat=20)
+def _projection():
+    from akta.projection import project
+
+    def run():
+        project(400_000_000, 2_800_000, years=30, paths=10_000, seed=0).summary(step=1)
+    return run
+
+
+@case('streamlit_rerun', repeat=40)
+def _streamlit_rerun():
+    from streamlit.logger import set_log_level
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import AppTest, local_script_runner
+    # Server Streamlit memakai satu ScriptCache per proses, sedangkan AppTest membuat yang
+    # baru setiap run sehingga AKTA.py dikompilasi ulang; samakan dengan server supaya yang
+    # diukur rerun skripnya, bukan panjang berkasnya
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+    at = AppTest.from_file(os.path.join(ROOT, 'AKTA.py'), default_timeout=60).run()
+    set_log_level('error')  # peringatan deprecation per rerun hanya mengganggu tabel hasil
+    at.text_input[0].input('Budi Santoso')  # di dalam form: terkirim saat submit
+    at.button[0].click().run()
+    at.button(key='siapkan_pdf').click().run()  # PDF baru dirender saat diminta
+    if at.exception:
+        raise RuntimeError(f"AKTA.py gagal dijalankan: {at.exception[0].message}")
+    # Tunggu render PDF latar belakang selesai supaya yang diukur rerun biasa; tombol
+    # ekspor CSV/JSON/XLSX sudah ada sejak awal, jadi yang ditunggu tombol PDF-nya
+    deadline = time.perf_counter() + 30
+    while (not any(b.label == PDF_LABEL for b in at.get('download_button'))
+           and time.perf_counter() < deadline):
+        time.sleep(0.1)
+        at.run()
+
+    def run():
+        at.run()
+    return run
+
+
+def measure(name):
+    setup, repeat = CASES[name]
+    fn = setup()
+    fn()  # pemanasan: impor, cache font, kompilasi regex
+
+    samples = []
+    gc.collect()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e3)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+
+    def pick(q):
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    return {
+        'repeat': repeat,
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'p50_ms': round(statistics.median(samples), 4),
+        'p90_ms': round(pick(0.90), 4),
+        'p99_ms': round(pick(0.99), 4),
+        'max_ms': round(samples[-1], 4),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='keyword', default='',
+                        help="hanya jalankan kasus yang namanya memuat teks ini")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="batas perlambatan median relatif baseline (bawaan: 0.30)")
+    parser.add_argument('--min-ms', type=float, default=DEFAULT_MIN_MS,
+                        help="median baseline minimal saat menerapkan ambang (bawaan: 1.0)")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    names = [n for n in CASES if args.keyword in n]
+    baseline = load_baseline(args.baseline)
+    results, regressions = {}, []
+
+    print(f"{'kasus':<18}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}"
+          f"{'peak KiB':>11}{'vs baseline':>13}")
+    for name in names:
+        result = results[name] = measure(name)
+        ref = baseline.get(name)
+        change = ''
+        if ref:
+            ratio = result['p50_ms'] / ref['p50_ms'] - 1
+            change = f"{ratio:+.1%}"
+            if result['p50_ms'] / max(ref['p50_ms'], args.min_ms) - 1 > args.threshold:
+                regressions.append((name, ratio))
+                change += ' !'
+        print(f"{name:<18}{result['p50_ms']:>10.3f}{result['p90_ms']:>10.3f}"
+              f"{result['p99_ms']:>10.3f}{result['peak_kib']:>11.1f}{change:>13}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+            fh.write('\n')
+        print(f"baseline disimpan ke {args.baseline}")
+        return 0
+
+    if regressions:
+        for name, ratio in regressions:
+            print(f"REGRESI: {name} {ratio:+.1%} (ambang {args.threshold:.0%}, "
+                  f"minimal {args.min_ms:g} ms)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
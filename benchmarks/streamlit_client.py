@@ -0,0 +1,241 @@
+"""Klien websocket minimal untuk server Streamlit sungguhan, pengganti browser.
+
+``AppTest`` selalu menjalankan seluruh skrip, sehingga tidak bisa mengukur form
+dan fragmen. Klien ini berbicara protokol yang sama dengan frontend
+(``BackMsg.rerun_script`` keluar, ``ForwardMsg`` masuk) dan meniru perilakunya:
+
+- widget di dalam form hanya disimpan sampai tombol submit form diklik;
+- widget di dalam fragmen menjalankan ulang fragmen itu saja;
+- fragmen ``run_every`` dijalankan ulang sesuai pesan ``auto_rerun``.
+
+Setiap ``script_finished`` dihitung per jenis (``penuh``, ``fragmen``,
+``terpotong``) dan setiap rerun dicatat latensinya. :func:`process_cpu` dan
+:func:`process_rss` membaca CPU dan memori proses server dari ``/proc``
+(Linux). Dipakai oleh :mod:`benchmarks.bench_reruns` dan
+:mod:`benchmarks.bench_sessions`::
+
+    server, port = start_server('AKTA.py')
+    async with await Session.connect(port) as sesi:
+        await sesi.open()
+        await sesi.set('Nama', 'Budi Santoso')
+        await sesi.click('🧮 Hitung Anggaran')
+        await sesi.click('📄 Siapkan Laporan PDF')
+        await sesi.wait_for('📥 Download PDF')
+        pdf = await sesi.download('📥 Download PDF')
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import Counter
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.Slider_pb2 import Slider
+from websockets.asyncio.client import connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ForwardMsg.script_finished -> jenis run
+_FINISHED = {
+    ForwardMsg.FINISHED_SUCCESSFULLY: 'penuh',
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR: 'gagal',
+    ForwardMsg.FINISHED_EARLY_FOR_RERUN: 'terpotong',
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY: 'fragmen',
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(script, port=None, env=None, timeout=30.0, options=()):
+    """Jalankan ``streamlit run script`` headless; kembalikan ``(Popen, port)`` setelah sehat.
+
+    ``options`` opsi konfigurasi Streamlit tambahan, mis. ``['--runner.postScriptGC', 'false']``.
+    """
+    port = port or _free_port()
+    env = dict(os.environ if env is None else env)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', script, '--server.headless', 'true',
+         '--server.port', str(port), '--server.enableXsrfProtection', 'false',
+         '--server.enableCORS', 'false', '--browser.gatherUsageStats', 'false', *options],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1).read()
+            return server, port
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                raise RuntimeError(f"server Streamlit untuk {script} tidak siap")
+            time.sleep(0.2)
+
+
+def process_rss(pid):
+    """Resident set size proses ``pid`` dalam byte, dari ``/proc/<pid>/status``."""
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def process_cpu(pid):
+    """Detik CPU (user + system) proses ``pid`` sejauh ini, dari ``/proc/<pid>/stat``."""
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+class Widget:
+    __slots__ = ('kind', 'id', 'form_id', 'fragment_id', 'integer', 'options', 'url')
+
+    def __init__(self, kind, proto, fragment_id):
+        self.kind = kind
+        self.id = proto.id
+        self.form_id = proto.form_id
+        self.fragment_id = fragment_id
+        self.integer = kind == 'number_input' and proto.data_type == NumberInput.INT
+        # select_slider mengirim label opsi yang sudah diformat
+        select = kind == 'slider' and proto.type == Slider.SELECT_SLIDER
+        self.options = tuple(proto.options) if select else ()
+        self.url = proto.url if kind == 'download_button' else ''
+
+
+class Session:
+    """Satu tab browser: widget dikenali dari label, nilai dikirim seperti frontend."""
+
+    def __init__(self, ws, port):
+        self.ws = ws
+        self.port = port
+        self.widgets = {}     # label -> Widget
+        self.by_id = {}
+        self.values = {}      # id widget -> nilai terkirim
+        self.pending = {}     # id form -> {id widget: nilai} yang belum di-submit
+        self.auto_rerun = {}  # id fragmen -> interval detik
+        self.seen = set()     # label widget pada run terakhir
+        self.runs = Counter()
+        self.latencies = []   # detik per rerun yang diminta klien, sampai script_finished
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(await connect(f'ws://127.0.0.1:{port}/_stcore/stream', max_size=None), port)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.ws.close()
+
+    async def open(self):
+        """Muat halaman (run penuh pertama)."""
+        await self._rerun()
+
+    async def set(self, label, value):
+        """Ubah nilai widget; widget form menunggu submit, lainnya langsung menjalankan ulang.
+
+        Untuk ``select_slider`` ``value`` adalah indeks opsi.
+        """
+        widget = self.widgets[label]
+        if widget.form_id:
+            self.pending.setdefault(widget.form_id, {})[widget.id] = value
+            return
+        self.values[widget.id] = value
+        await self._rerun(widget.fragment_id)
+
+    async def click(self, label):
+        """Klik tombol; tombol submit form ikut mengirim nilai widget form yang tertunda."""
+        widget = self.widgets[label]
+        if widget.form_id:
+            self.values.update(self.pending.pop(widget.form_id, {}))
+        await self._rerun(widget.fragment_id, trigger=widget.id)
+
+    async def wait_for(self, label, timeout=60.0):
+        """Jalankan fragmen ``run_every`` seperti browser sampai widget ``label`` muncul."""
+        deadline = time.monotonic() + timeout
+        while label not in self.seen:
+            if not self.auto_rerun or time.monotonic() > deadline:
+                raise TimeoutError(f"{label!r} tidak muncul")
+            fragment_id, interval = next(iter(self.auto_rerun.items()))
+            await asyncio.sleep(interval)
+            await self._rerun(fragment_id, auto=True)
+
+    async def download(self, label):
+        """Unduh isi tombol ``st.download_button`` berlabel ``label`` dari server media."""
+        url = f'http://127.0.0.1:{self.port}{self.widgets[label].url}'
+
+        def fetch():
+            with urllib.request.urlopen(url, timeout=60) as response:
+                return response.read()
+        return await asyncio.to_thread(fetch)
+
+    async def _rerun(self, fragment_id='', trigger=None, auto=False):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.query_string = ''
+        state.page_script_hash = ''
+        state.fragment_id = fragment_id
+        state.is_auto_rerun = auto
+        for widget_id, value in self.values.items():
+            self._encode(state.widget_states.widgets.add(), widget_id, value)
+        if trigger:
+            state.widget_states.widgets.add(id=trigger, trigger_value=True)
+        self.seen = set()
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        await self._until_finished()
+        self.latencies.append(time.perf_counter() - start)
+
+    def _encode(self, proto, widget_id, value):
+        proto.id = widget_id
+        widget = self.by_id[widget_id]
+        if isinstance(value, bool):
+            proto.bool_value = value
+        elif isinstance(value, str):
+            proto.string_value = value
+        elif widget.options:
+            proto.string_array_value.data.append(widget.options[value])
+        elif widget.kind == 'slider':
+            proto.double_array_value.data.append(value)
+        elif widget.integer:
+            proto.int_value = value
+        else:
+            proto.double_value = value
+
+    async def _until_finished(self):
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            kind = msg.WhichOneof('type')
+            if kind == 'new_session' and not msg.new_session.fragment_ids_this_run:
+                self.auto_rerun.clear()  # run penuh: frontend membuang semua timer fragmen
+            elif kind == 'auto_rerun':
+                self.auto_rerun[msg.auto_rerun.fragment_id] = msg.auto_rerun.interval
+            elif kind == 'stop_auto_rerun':
+                for fragment_id in msg.stop_auto_rerun.fragment_ids:
+                    self.auto_rerun.pop(fragment_id, None)
+            elif kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                self._track(msg.delta.new_element, msg.delta.fragment_id)
+            elif kind == 'script_finished':
+                status = _FINISHED[msg.script_finished]
+                self.runs[status] += 1
+                if status != 'terpotong':
+                    return status
+
+    def _track(self, element, fragment_id):
+        kind = element.WhichOneof('type')
+        proto = getattr(element, kind)
+        if not getattr(proto, 'id', '') or not getattr(proto, 'label', ''):
+            return
+        widget = Widget(kind, proto, fragment_id)
+        self.widgets[proto.label] = self.by_id[widget.id] = widget
+        self.seen.add(proto.label)
@@ -0,0 +1,27 @@
+"""Pembacaan rumah tangga untuk mode batch (:func:`akta.batch.read_households`)."""
+import pytest
+
+from akta.batch import read_households
+
+
+@pytest.mark.parametrize('column, value', [
+    ('tetap', '-5'), ('tetap', 'nan'), ('tetap', '1e19'), ('tidak_tetap', 'inf'),
+    ('harga_emas', '-1'), ('usia', 'inf'),
+])
+def test_rejects_bad_amounts(tmp_path, column, value):
+    row = {'nama': 'A', 'usia': '30', 'tetap': '100000000', 'tidak_tetap': '0',
+           'harga_emas': '1000000', column: value}
+    path = tmp_path / 'in.csv'
+    path.write_text(','.join(row) + '\n' + ','.join(row.values()) + '\n', encoding='utf-8')
+    [parsed] = read_households(str(path))
+    assert parsed == {'nama': 'A', 'galat': f"{column} tidak valid: {value!r}"}
+
+
+def test_accepts_amounts_from_jsonl(tmp_path):
+    path = tmp_path / 'in.jsonl'
+    path.write_text('{"nama": "A", "usia": 30, "tetap": 1.5e8, "tidak_tetap": 0, '
+                    '"harga_emas": 1000000}\n'
+                    '{"nama": "B", "usia": 30, "tetap": -1, "tidak_tetap": 0}\n', encoding='utf-8')
+    good, bad = read_households(str(path))
+    assert good['tetap'] == 1.5e8 and good['harga_emas'] == 1000000
+    assert bad['galat'] == "tetap tidak valid: -1"
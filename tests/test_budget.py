@@ -0,0 +1,65 @@
+"""Jalur vektor :mod:`akta.budget` (batch anggaran, format rupiah) sama persis dengan skalar."""
+import numpy as np
+import pytest
+
+from akta.budget import (POS_KEYS, calculate_budget, calculate_budget_batch, format_idr,
+                         format_idr_bulk, nisab)
+
+HARGA_EMAS = 2_750_000.0
+BATAS = nisab(HARGA_EMAS)
+INCOMES = [0.0, 1.0, 12_345.67, 100_000_000.0, BATAS - 1.0, np.nextafter(BATAS, 0), BATAS,
+           np.nextafter(BATAS, np.inf), BATAS + 1.0, 330_000_000.0, 1e15 + 0.5]
+
+
+def _assert_rows_equal(batch, scalars):
+    assert set(batch) == set(POS_KEYS)
+    for key in POS_KEYS:
+        assert batch[key].dtype == np.float64
+        # Identik bit per bit, bukan hanya mendekati
+        assert batch[key].tolist() == [row[key] for row in scalars], key
+
+
+def test_batch_matches_scalar():
+    _assert_rows_equal(calculate_budget_batch(np.array(INCOMES)),
+                       [calculate_budget(float(x)) for x in INCOMES])
+
+
+@pytest.mark.parametrize('as_array', [False, True])
+def test_batch_matches_scalar_around_nisab(as_array):
+    harga = np.full(len(INCOMES), HARGA_EMAS) if as_array else HARGA_EMAS
+    batch = calculate_budget_batch(INCOMES, harga_emas=harga)
+    scalars = [calculate_budget(float(x), harga_emas=HARGA_EMAS) for x in INCOMES]
+    _assert_rows_equal(batch, scalars)
+    # Di bawah nisab Pos Zakat nol, tepat di nisab zakat wajib
+    zakat = dict(zip(INCOMES, batch['zakat'].tolist()))
+    assert zakat[BATAS - 1.0] == 0 and zakat[BATAS] > 0
+
+
+def test_batch_accepts_per_row_gold_prices():
+    harga = np.array([HARGA_EMAS, 1_000_000.0, 5_000_000.0])
+    incomes = [BATAS, BATAS, BATAS]
+    _assert_rows_equal(calculate_budget_batch(incomes, harga_emas=harga),
+                       [calculate_budget(x, harga_emas=h) for x, h in zip(incomes, harga.tolist())])
+
+
+# Tepi kelompok ribuan, pembulatan half-even, -0, bukan-angka dan batas int64
+FLOATS = [0.0, -0.0, 0.4, -0.4, 0.5, 1.5, 2.5, -2.5, 999.5, 1000.0, 999_999.49, 123_456_789.5,
+          -1e15, 2.0 ** 53, 1e20, float('nan'), float('inf'), -float('inf')]
+INTS = [0, 1, -1, 999, 1000, -1000, 10 ** 15 + 7, 2 ** 62, -(2 ** 63), 2 ** 63 - 1]
+
+
+@pytest.mark.parametrize('values', [FLOATS, INTS])
+@pytest.mark.parametrize('repeat', [1, 10])  # di bawah dan di atas _BULK_MIN
+def test_format_idr_bulk_matches_format_idr(values, repeat):
+    values = values * repeat
+    expected = [format_idr(x) for x in values]
+    if isinstance(values[0], int):
+        # format_idr melewatkan int lewat float; bulk memformatnya persis
+        expected = [f"Rp {x:,}".replace(",", ".") for x in values]
+    assert format_idr_bulk(np.array(values)) == expected
+    assert format_idr_bulk(values) == expected
+
+
+def test_format_idr_bulk_separators():
+    assert format_idr_bulk(np.arange(64) * 123_456 + 1_234_567, prefix='', thousands=',',
+                           decimal='.', decimals=2)[:2] == ['12,345.67', '13,580.23']
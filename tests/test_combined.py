@@ -0,0 +1,103 @@
+"""PDF gabungan :mod:`akta.combined` harus tetap PDF yang valid dan urut."""
+import io
+import re
+from datetime import date
+
+import pytest
+
+from akta.budget import calculate_budget_rupiah
+from akta.combined import PdfConcatWriter, write_combined_pdf
+from akta.pdf import generate_pdf
+from akta.projection import project_summary
+
+TANGGAL = date(2026, 1, 31)
+
+
+def households(n):
+    return [{'nama': f'Anggota {i}', 'usia': 30 + i, 'tetap': 100_000_000 * (i + 1),
+             'tidak_tetap': 50_000_000, 'harga_emas': 2_800_000} for i in range(n)]
+
+
+def check_structure(data):
+    """Xref menunjuk tepat ke setiap objek, trailer dan Count halaman konsisten."""
+    assert data.startswith(b'%PDF-1.4\n') and data.endswith(b'%%EOF\n')
+    xref_at = int(data[data.rindex(b'startxref') + 9:].split()[0])
+    assert data[xref_at:xref_at + 5] == b'xref\n'
+    header = data[xref_at:].split(b'\n', 3)
+    first, size = map(int, header[1].split())
+    entries = re.findall(rb'(\d{10}) (\d{5}) ([nf]) \n',
+                         data[xref_at:data.index(b'trailer', xref_at)])
+    assert first == 0 and len(entries) == size
+    assert entries[0][2] == b'f'
+    for number, (offset, _, kind) in enumerate(entries[1:], start=1):
+        assert kind == b'n'
+        offset = int(offset)
+        assert data[offset:offset + 20].startswith(b'%d 0 obj\n' % number), number
+    assert int(re.search(rb'/Size (\d+)', data[xref_at:]).group(1)) == size
+    # Setiap objek yang dirujuk ada
+    refs = {int(n) for n in re.findall(rb'(\d+) 0 R', data)}
+    assert refs <= set(range(1, size))
+    return int(re.search(rb'/Count (\d+) /Type /Pages', data).group(1))
+
+
+def test_concat_writer_structure_and_order():
+    out = io.BytesIO()
+    pdfs = []
+    for row in households(3):
+        total = row['tetap'] + row['tidak_tetap']
+        allocations = calculate_budget_rupiah(total, None, row['harga_emas'])
+        pdfs.append(generate_pdf(row['nama'], row['usia'], row['tetap'], row['tidak_tetap'],
+                                 total, row['harga_emas'], allocations, TANGGAL).getvalue())
+    # Laporan dengan proyeksi punya lebih banyak halaman dan objek
+    proyeksi = project_summary(400_000_000, 2_800_000, 20, paths=500).every(5)
+    pdfs.append(generate_pdf('Dengan Proyeksi', 40, 250_000_000, 150_000_000, 400_000_000,
+                             2_800_000, calculate_budget_rupiah(400_000_000, None, 2_800_000),
+                             TANGGAL, proyeksi=proyeksi).getvalue())
+    with PdfConcatWriter(out) as writer:
+        for data in pdfs:
+            writer.add(data)
+    data = out.getvalue()
+    pages = check_structure(data)
+    assert writer.reports == 4
+    assert pages == writer.pages == sum(len(re.findall(rb'/Type /Page\b', p)) for p in pdfs)
+
+    pymupdf = pytest.importorskip('pymupdf')
+    doc = pymupdf.open(stream=data)
+    assert doc.page_count == pages
+    text = [page.get_text() for page in doc]
+    names = ['Anggota 0', 'Anggota 1', 'Anggota 2', 'Dengan Proyeksi']
+    firsts = [next(i for i, t in enumerate(text) if name in t) for name in names]
+    assert firsts == sorted(firsts)
+
+
+@pytest.mark.parametrize('engine', ['canvas', 'platypus'])
+def test_write_combined_pdf_to_path(tmp_path, engine):
+    path = tmp_path / 'gabungan.pdf'
+    reports, pages = write_combined_pdf(households(5), str(path), TANGGAL, engine=engine)
+    assert reports == 5
+    assert check_structure(path.read_bytes()) == pages >= 5
+
+
+def test_write_combined_pdf_skips_invalid_rows():
+    rows = households(3)
+    rows.insert(1, {'nama': 'Rusak', 'galat': "usia tidak valid: 'tigapuluh'"})
+    out, errors = io.BytesIO(), io.StringIO()
+    reports, _ = write_combined_pdf(rows, out, TANGGAL, errors=errors)
+    assert reports == 3
+    assert errors.getvalue() == "baris 2: usia tidak valid: 'tigapuluh'\n"
+    check_structure(out.getvalue())
+
+
+def test_empty_combined_pdf_is_valid():
+    out = io.BytesIO()
+    PdfConcatWriter(out).close()
+    assert check_structure(out.getvalue()) == 0
+
+
+def test_canvas_and_platypus_concat_identically():
+    a, b = io.BytesIO(), io.BytesIO()
+    write_combined_pdf(households(2), a, TANGGAL, engine='canvas')
+    write_combined_pdf(households(2), b, TANGGAL, engine='platypus')
+    pymupdf = pytest.importorskip('pymupdf')
+    texts = [[page.get_text() for page in pymupdf.open(stream=out.getvalue())] for out in (a, b)]
+    assert texts[0] == texts[1]
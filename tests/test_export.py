@@ -0,0 +1,81 @@
+"""Ekspor rumah tangga (:func:`akta.export.write_households`) dengan baris yang rusak."""
+import csv
+import io
+import json
+import zipfile
+
+import pytest
+
+from akta import export
+from akta.export import write_households
+
+
+def _row(nama, tetap, tidak_tetap=0, harga_emas=1_000_000):
+    return {'nama': nama, 'usia': 30, 'tetap': tetap, 'tidak_tetap': tidak_tetap,
+            'harga_emas': harga_emas}
+
+
+ROWS = [
+    _row('A', 100_000_000),
+    _row('B', float('nan')),
+    _row('C', 1e19),
+    _row('D', 4 * 10 ** 18),
+    _row('E', -5),
+    {'nama': 'F', 'galat': "tetap tidak valid: 'x'"},
+    _row('G', 200_000_000, harga_emas=float('inf')),
+    _row('H', 200_000_000),
+]
+GOOD = ['A', 'H']
+
+
+@pytest.mark.parametrize('chunk', [1, 3, 4096])
+def test_bad_rows_inside_chunk_are_reported(monkeypatch, chunk):
+    monkeypatch.setattr(export, '_CHUNK', chunk)
+    out, errors = io.BytesIO(), io.StringIO()
+    done, failed = write_households(ROWS, out, 'csv', errors=errors)
+    assert (done, failed) == (len(GOOD), len(ROWS) - len(GOOD))
+    rows = list(csv.DictReader(io.StringIO(out.getvalue().decode('utf-8'))))
+    assert [r['nama'] for r in rows] == GOOD
+    # Baris yang gagal di jalur vektor dilaporkan saat bloknya ditulis
+    reported = {line.split(':')[0] for line in errors.getvalue().splitlines()}
+    assert reported == {f'baris {n}' for n in range(2, 8)}
+
+
+def test_bad_rows_keep_xlsx_and_json_valid():
+    out = io.BytesIO()
+    assert write_households(ROWS, out, 'xlsx', errors=io.StringIO()) == (2, 6)
+    with zipfile.ZipFile(io.BytesIO(out.getvalue())) as z:
+        assert z.testzip() is None
+        sheet = z.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert '<v>nan' not in sheet and '<v>inf' not in sheet
+
+    out = io.BytesIO()
+    assert write_households(ROWS, out, 'json', errors=io.StringIO()) == (2, 6)
+    assert [r['nama'] for r in json.loads(out.getvalue())] == GOOD
+
+
+def test_xlsx_cells_are_valid_xml():
+    from xml.etree import ElementTree
+
+    out = io.BytesIO()
+    writer = export._XlsxWriter(out, ('nama', 'nilai'))
+    writer.write_rows([('a\x00b\x1fc\td', float('nan')), ('<&>', float('inf')), ('ok', 1.5)])
+    writer.close()
+    with zipfile.ZipFile(io.BytesIO(out.getvalue())) as z:
+        sheet = ElementTree.fromstring(z.read('xl/worksheets/sheet1.xml'))
+    ns = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+    cells = {c.get('r'): ''.join(c.itertext()) for c in sheet.iterfind('.//s:c', ns)}
+    assert cells == {'A1': 'nama', 'B1': 'nilai', 'A2': 'abc\td', 'A3': '<&>',
+                     'A4': 'ok', 'B4': '1.5'}
+
+
+def test_table_xlsx_notes_monthly_rounding():
+    from akta.budget import calculate_budget_rupiah
+    from akta.money import MONTHLY_NOTE
+
+    allocations = calculate_budget_rupiah(330_000_007)
+    with zipfile.ZipFile(io.BytesIO(export.export_table(allocations, fmt='xlsx'))) as z:
+        sheet = z.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert sheet.endswith(f'{MONTHLY_NOTE}</t></is></c></row></sheetData></worksheet>')
+    rows = list(csv.reader(io.StringIO(export.export_table(allocations).decode('utf-8'))))
+    assert rows[-1][0] == 'total_anggaran'
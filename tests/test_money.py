@@ -0,0 +1,87 @@
+"""Invarian alokasi rupiah bulat (:mod:`akta.money`, :func:`akta.budget.calculate_budget_rupiah`)."""
+import numpy as np
+import pytest
+
+from akta.budget import calculate_budget_rupiah
+from akta.money import allocate, integer_weights, monthly_amount, split_monthly, to_rupiah
+from akta.rules import get_rules
+
+TOTALS = [0, 1, 11, 12, 13, 999, 100_000_001, 400_000_007, 10 ** 15 + 7]
+POS = [k for k in get_rules('standar').keys
+       if k not in ('utang_produktif', 'utang_konsumtif', 'total_anggaran', 'surplus_defisit')]
+
+
+def test_allocate_docstring_example():
+    assert allocate(100, [1, 1, 1]) == [34, 33, 33]
+
+
+@pytest.mark.parametrize('total', TOTALS)
+@pytest.mark.parametrize('weights', [[1, 1, 1], [25, 75, 350, 100, 100, 350], [7], [3, 0, 5]])
+def test_allocate_sums_to_total(total, weights):
+    parts = allocate(total, weights)
+    assert sum(parts) == total
+    assert all(isinstance(p, int) and p >= 0 for p in parts)
+    # Setiap bagian paling jauh satu rupiah dari bagian tepatnya
+    exact = [total * w / sum(weights) for w in weights]
+    assert all(abs(p - e) < 1 + 1e-6 * max(1, e) for p, e in zip(parts, exact))
+
+
+def test_allocate_vector_matches_scalar():
+    weights = [25, 75, 350, 100, 100, 350]
+    rows = allocate(np.array(TOTALS, dtype=np.int64), np.array(weights))
+    assert rows.dtype == np.int64
+    assert rows.tolist() == [allocate(t, weights) for t in TOTALS]
+
+
+def test_allocate_rejects_int64_overflow():
+    with pytest.raises(OverflowError):
+        allocate(np.array([2 ** 62]), np.array([1, 3]))
+
+
+def test_integer_weights_exact():
+    weights, denom = integer_weights([2.5, 7.5, 35, 10, 10, 35])
+    assert [w / denom for w in weights] == [0.025, 0.075, 0.35, 0.1, 0.1, 0.35]
+    assert sum(weights) == denom
+
+
+@pytest.mark.parametrize('annual', TOTALS)
+def test_split_monthly_exact(annual):
+    months = split_monthly(annual)
+    assert len(months) == 12
+    assert sum(months) == annual
+    assert max(months) - min(months) <= 1
+    assert months == sorted(months, reverse=True)  # sisa jatuh di bulan-bulan awal
+    assert monthly_amount(annual) == months[0]
+
+
+def test_split_monthly_vector_matches_scalar():
+    rows = split_monthly(np.array(TOTALS, dtype=np.int64))
+    assert rows.tolist() == [split_monthly(t) for t in TOTALS]
+
+
+def test_to_rupiah_half_even():
+    assert to_rupiah(2.5) == 2 and to_rupiah(3.5) == 4
+    assert to_rupiah([0.5, 1.5, 2.4]).tolist() == [0, 2, 2]
+    with pytest.raises(OverflowError):
+        to_rupiah([float('inf')])
+
+
+@pytest.mark.parametrize('total', TOTALS[1:])
+@pytest.mark.parametrize('harga_emas', [None, 2_800_000])
+def test_budget_rupiah_invariants(total, harga_emas):
+    a = calculate_budget_rupiah(total, None, harga_emas)
+    assert all(isinstance(v, int) for v in a.values())
+    assert a['total_anggaran'] == total
+    assert sum(a[k] for k in POS) == total
+    assert a['utang_produktif'] + a['utang_konsumtif'] == a['utang_total']
+    assert a['surplus_defisit'] == 0
+    if harga_emas is not None and total < harga_emas * 85:
+        assert a['zakat'] == 0
+
+
+def test_budget_rupiah_vector_matches_scalar():
+    totals = TOTALS[1:]
+    batch = calculate_budget_rupiah(np.array(totals, dtype=np.int64), None, 2_800_000)
+    for i, total in enumerate(totals):
+        scalar = calculate_budget_rupiah(total, None, 2_800_000)
+        assert {k: int(v[i]) for k, v in batch.items()} == scalar
@@ -0,0 +1,52 @@
+"""Mesin ``canvas`` harus menghasilkan laporan yang sama dengan ``platypus``."""
+from datetime import date
+
+import pytest
+
+from akta import _pdf_canvas
+from akta.budget import calculate_budget_rupiah, nisab
+from akta.pdf import generate_pdf, generate_pdf_canvas
+from akta.projection import project_summary
+
+pytest.importorskip('pymupdf')
+from benchmarks.bench_pdf_canvas import visual_diff  # noqa: E402
+
+TANGGAL = date(2026, 1, 31)
+HARGA_EMAS = 2_800_000
+
+
+def _record(name='Budi Santoso', tetap=250_000_000, tidak_tetap=150_000_000, **changes):
+    total = tetap + tidak_tetap
+    allocations = dict(calculate_budget_rupiah(total, None, HARGA_EMAS), **changes)
+    return (name, 35, tetap, tidak_tetap, total, HARGA_EMAS, allocations, TANGGAL)
+
+
+CANVAS = {
+    'surplus': (_record(), {}),
+    'defisit': (_record(surplus_defisit=-12_500_000), {}),
+    'di bawah nisab': (_record(tetap=int(nisab(HARGA_EMAS)) - 1, tidak_tetap=0), {}),
+    'proyeksi': (_record(), {'proyeksi': project_summary(400_000_000, HARGA_EMAS, 20,
+                                                         paths=200).every(5)}),
+}
+
+
+def _same(args, kwargs):
+    pixels, spans = visual_diff(generate_pdf(*args, **kwargs).getvalue(),
+                                generate_pdf_canvas(*args, **kwargs).getvalue(), dpi=72)
+    assert (pixels, spans) == (0, 0)
+
+
+@pytest.mark.parametrize('case', CANVAS)
+def test_canvas_matches_platypus(monkeypatch, case):
+    args, kwargs = CANVAS[case]
+    generate_pdf_canvas(*args, **kwargs)  # rekam tata letak dulu
+
+    def fallback(*args, **kwargs):
+        raise AssertionError("laporan ini seharusnya digambar langsung ke canvas")
+
+    monkeypatch.setattr(_pdf_canvas, 'generate_pdf_platypus', fallback)
+    _same(args, kwargs)
+
+
+def test_long_name_falls_back_to_platypus():
+    _same(_record(name='Raden Mas ' * 12), {})
@@ -0,0 +1,74 @@
+"""Cache galat :class:`akta.render_queue.RenderQueue`: galat sementara boleh dicoba lagi."""
+import time
+from datetime import date
+
+import pytest
+from reportlab.platypus.doctemplate import LayoutError
+
+from akta import render_queue
+from akta.budget import calculate_budget_rupiah
+from akta.render_queue import RenderQueue
+
+ARGS = ('Budi', 35, 240_000_000, 90_000_000, 2_750_000,
+        calculate_budget_rupiah(330_000_000), date(2026, 1, 1))
+
+
+@pytest.fixture
+def queue():
+    queue = RenderQueue(workers=1)
+    yield queue
+    queue.shutdown()
+
+
+def _result(queue, future):
+    # Callback _finish bisa berjalan sesaat setelah result() kembali
+    try:
+        return future.result(timeout=10)
+    finally:
+        deadline = time.monotonic() + 10
+        while queue.pending and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+
+def _failing(*exceptions):
+    calls = []
+
+    def render(*args):
+        calls.append(args)
+        if len(calls) <= len(exceptions):
+            raise exceptions[len(calls) - 1]
+        return b'%PDF'
+
+    return render, calls
+
+
+def test_transient_failure_is_retried_after_ttl(monkeypatch, queue):
+    render, calls = _failing(OSError("font tidak terbaca"))
+    monkeypatch.setattr(render_queue, '_render', render)
+    monkeypatch.setattr(render_queue, '_FAILURE_TTL', 0.2)
+
+    with pytest.raises(OSError):
+        _result(queue, queue.submit(*ARGS))
+    # Selama TTL galatnya diingat, tanpa render ulang
+    assert isinstance(queue.lookup(queue.key(*ARGS)).exception(), OSError)
+    with pytest.raises(OSError):
+        _result(queue, queue.submit(*ARGS))
+    assert len(calls) == 1
+
+    time.sleep(0.2)
+    assert queue.lookup(queue.key(*ARGS)) is None
+    assert _result(queue, queue.submit(*ARGS)) == b'%PDF'
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('exception', [ValueError("nama terlalu panjang"), LayoutError("tabel")])
+def test_deterministic_failure_is_remembered(monkeypatch, queue, exception):
+    render, calls = _failing(exception)
+    monkeypatch.setattr(render_queue, '_render', render)
+    monkeypatch.setattr(render_queue, '_FAILURE_TTL', 0.0)
+
+    with pytest.raises(type(exception)):
+        _result(queue, queue.submit(*ARGS))
+    with pytest.raises(type(exception)):
+        _result(queue, queue.submit(*ARGS))
+    assert len(calls) == 1
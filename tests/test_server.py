@@ -0,0 +1,169 @@
+"""Parsing HTTP, header respons dan endpoint :mod:`akta.server` tanpa klien eksternal."""
+import asyncio
+import json
+from datetime import date
+from urllib.parse import unquote
+
+import pytest
+
+from akta.server import (MAX_BODY, AktaServer, HttpError, _encode_response, _read_request,
+                         content_disposition)
+
+TANGGAL = date(2026, 1, 31)
+
+
+def read(raw):
+    async def go():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await _read_request(reader)
+    return asyncio.run(go())
+
+
+def test_read_request_with_body():
+    body = b'{"tetap": 1}'
+    method, path, headers, got = read(
+        b"POST /anggaran HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+        b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+    assert (method, path, got) == ('POST', '/anggaran', body)
+    assert headers['content-type'] == 'application/json'
+
+
+def test_read_request_eof_is_none():
+    assert read(b'') is None
+
+
+@pytest.mark.parametrize('raw, status', [
+    (b"GARBAGE\r\n\r\n", 400),
+    (b"POST /pdf HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n", 411),
+    (b"POST /pdf HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST /pdf HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (MAX_BODY + 1), 413),
+    (b"GET /health HTTP/1.1\r\n" + b"".join(b"X-%d: 1\r\n" % i for i in range(101)) + b"\r\n",
+     400),
+])
+def test_read_request_rejects(raw, status):
+    with pytest.raises(HttpError) as info:
+        read(raw)
+    assert info.value.status == status
+
+
+def test_encode_response():
+    raw = _encode_response(200, b'{}', (('Content-Type', 'application/json'),), keep_alive=False)
+    head, _, body = raw.partition(b'\r\n\r\n')
+    assert head.split(b'\r\n') == [b'HTTP/1.1 200 OK', b'Content-Length: 2',
+                                   b'Connection: close', b'Content-Type: application/json']
+    assert body == b'{}'
+
+
+@pytest.mark.parametrize('value', ['a\r\nSet-Cookie: x=1', 'a\nb', 'a\rb'])
+def test_encode_response_refuses_header_injection(value):
+    with pytest.raises(ValueError):
+        _encode_response(200, b'', (('X-Test', value),))
+
+
+@pytest.mark.parametrize('name', [
+    'Budi Santoso',
+    'Budi\r\nSet-Cookie: sesi=curian',
+    'Siti "Aminah"; filename=evil.exe',
+    'Ñoño Çelik',
+    'Dewi 🌸 李',
+    '   ',
+])
+def test_content_disposition_is_safe(name):
+    header = content_disposition(name, TANGGAL)
+    assert '\r' not in header and '\n' not in header
+    header.encode('latin-1')  # selalu bisa dikirim sebagai header HTTP/1.1
+    ascii_part, star_part = header.split('; filename*=')
+    filename = ascii_part.split('filename=', 1)[1]
+    assert filename.startswith('"AKTA_') and filename.endswith('_20260131.pdf"')
+    assert '"' not in filename[1:-1] and filename.isascii()
+    assert star_part.startswith("UTF-8''") and star_part.isascii()
+    # filename* mempertahankan nama asli (spasi menjadi garis bawah)
+    assert unquote(star_part[len("UTF-8''"):]) == (
+        f"AKTA_{'_'.join(name.split())}_20260131.pdf")
+
+
+def dispatch(method, path, payload=None, body=None):
+    if body is None and payload is not None:
+        body = json.dumps(payload).encode()
+    status, data, headers = asyncio.run(AktaServer(workers=1).dispatch(method, path, body or b''))
+    return status, data, dict(headers)
+
+
+def test_dispatch_budget():
+    status, data, headers = dispatch('POST', '/anggaran', {
+        'tetap': 250_000_000, 'tidak_tetap': 150_000_000, 'harga_emas': 2_800_000, 'bulat': True})
+    assert status == 200
+    assert headers['Content-Type'].startswith('application/json')
+    result = json.loads(data)
+    assert result['total_pemasukan'] == 400_000_000
+    assert result['alokasi']['total_anggaran'] == 400_000_000
+
+
+def test_dispatch_batch():
+    status, data, _ = dispatch('POST', '/anggaran/batch',
+                               {'pemasukan': [100_000_000, 400_000_000], 'bulat': True})
+    assert status == 200
+    assert json.loads(data)['alokasi']['total_anggaran'] == [100_000_000, 400_000_000]
+
+
+@pytest.mark.parametrize('method, path, body, status', [
+    ('GET', '/tidak-ada', None, 404),
+    ('GET', '/anggaran', None, 405),
+    ('POST', '/anggaran', b'{bukan json', 400),
+    ('POST', '/anggaran', b'[1, 2]', 400),
+    ('POST', '/anggaran', b'{"tetap": "satu"}', 400),
+    ('POST', '/anggaran/batch', b'{"pemasukan": ["x"]}', 400),
+    ('POST', '/pdf', b'{"usia": 30, "tetap": 1, "harga_emas": 1}', 400),
+    ('POST', '/pdf', b'{"nama": "A", "usia": 30, "tetap": 1, "harga_emas": 1, '
+                     b'"tanggal": "31-01-2026"}', 400),
+])
+def test_dispatch_errors(method, path, body, status):
+    got, data, _ = dispatch(method, path, body=body)
+    assert got == status
+    assert 'error' in json.loads(data)
+
+
+def exchange(port, request):
+    async def go():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 60)  # sampai server menutup koneksi
+        writer.close()
+        return response
+    return go()
+
+
+def test_pdf_over_http_with_unsafe_names():
+    names = ['Budi\r\nSet-Cookie: sesi=curian', 'Dewi 🌸 李']
+
+    async def go():
+        server = AktaServer(workers=1)
+        ready = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(server.serve(port=0, ready=ready.set_result))
+        port = await asyncio.wait_for(ready, 60)
+        try:
+            responses = []
+            for name in names:
+                body = json.dumps({'nama': name, 'usia': 30, 'tetap': 250_000_000,
+                                   'tidak_tetap': 150_000_000, 'harga_emas': 2_800_000,
+                                   'tanggal': '2026-01-31'}).encode()
+                # Connection: close harus berakhir dengan EOF, tidak menggantung
+                responses.append(await exchange(port, (
+                    b"POST /pdf HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n"
+                    % len(body)) + body))
+            return responses
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    for response in asyncio.run(go()):
+        head, _, body = response.partition(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        assert lines[0] == 'HTTP/1.1 200 OK'
+        assert not any(line.lower().startswith('set-cookie') for line in lines)
+        assert 'Content-Type: application/pdf' in lines
+        assert body.startswith(b'%PDF-') and body.rstrip().endswith(b'%%EOF')